@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.models.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.database import get_async_db
+from app.models import models, schemas
 from pydantic import BaseModel
 from typing import Dict, Any
 
@@ -27,7 +28,7 @@ class AgentRequest(BaseModel):
     context: Dict[str, Any] = {}
 
 @router.post("/request")
-async def submit_request(request: AgentRequest, db: Session = Depends(get_db)):
+async def submit_request(request: AgentRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Submit a prompt to the ManagerAgent for processing
     """
@@ -45,9 +46,13 @@ async def submit_request(request: AgentRequest, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/status/{task_id}")
-async def get_task_status(task_id: str, db: Session = Depends(get_db)):
+@router.get("/status/{task_id}", response_model=schemas.AgentTaskStatus)
+async def get_task_status(task_id: str, db: AsyncSession = Depends(get_async_db)):
     """
-    Get the status of a specific agent task
+    Get the status and progress of a specific agent task
     """
-    return {"task_id": task_id, "status": "completed"}
+    # Polled right after the task is created, so this reads from the primary rather than a replica
+    task = await db.get(models.AgentTask, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
@@ -1,55 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.models.database import get_async_db, get_read_db
+from app.models.write_queue import run_write
 from app.models import models, schemas
+from app.services import batch_mutations, resource_versions
+from app.services.cache import ALL_HOUSEHOLDS
+from app.services.change_feed import change_feed
+from app.services.pagination import paginate
 from datetime import datetime
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Chore])
-def list_chores(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    chores = db.query(models.Chore).offset(skip).limit(limit).all()
-    return chores
+async def list_chores(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    unchanged = await resource_versions.not_modified(request, response, db, ALL_HOUSEHOLDS, "chores")
+    if unchanged:
+        return unchanged
+
+    stmt = select(models.Chore)
+    return await paginate(db, stmt, [models.Chore.name, models.Chore.id], response, limit, skip, cursor)
 
 @router.post("/", response_model=schemas.Chore)
-def create_chore(chore: schemas.ChoreCreate, db: Session = Depends(get_db)):
+async def create_chore(chore: schemas.ChoreCreate, db: AsyncSession = Depends(get_async_db)):
     # In a real app, we'd get household_id from the authenticated user
     # For local demo, we'll use a dummy ID or create one if none exists
-    household = db.query(models.Household).first()
-    if not household:
-        household = models.Household(name="Default Household")
-        db.add(household)
-        db.commit()
-        db.refresh(household)
-    
-    db_chore = models.Chore(**chore.model_dump(), household_id=household.id)
-    db.add(db_chore)
-    db.commit()
-    db.refresh(db_chore)
+    async def write(session):
+        household = await session.scalar(select(models.Household).limit(1))
+        if not household:
+            household = models.Household(name="Default Household")
+            session.add(household)
+            await session.flush()
+
+        db_chore = models.Chore(**chore.model_dump(), household_id=household.id)
+        session.add(db_chore)
+        await session.flush()
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "chores")
+        return db_chore
+
+    db_chore = await run_write(db, write)
+    await change_feed.publish(ALL_HOUSEHOLDS, "chores", "created", [db_chore.id])
     return db_chore
 
+# Declared before /{chore_id} so "batch" is not taken for an id
+@router.patch("/batch", response_model=schemas.ChoreBatchResult)
+async def batch_update_chores(batch: schemas.ChoreBatch, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        owner_id = None
+        if batch.create:
+            household = await session.scalar(select(models.Household).limit(1))
+            if not household:
+                household = models.Household(name="Default Household")
+                session.add(household)
+                await session.flush()
+            owner_id = household.id
+
+        outcome = await session.run_sync(
+            batch_mutations.apply_batch,
+            models.Chore,
+            "chores",
+            ALL_HOUSEHOLDS,
+            owner_id,
+            [chore.model_dump() for chore in batch.create],
+            [change.model_dump(exclude_unset=True) for change in batch.update],
+            batch.delete
+        )
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "chores")
+        chores = (await session.scalars(select(models.Chore).where(
+            models.Chore.id.in_(outcome["created"] + outcome["updated"])
+        ).execution_options(populate_existing=True))).all()
+        return outcome, schemas.ChoreBatchResult(results=outcome["results"], items=chores)
+
+    outcome, result = await run_write(db, write)
+    await change_feed.publish_batch(ALL_HOUSEHOLDS, "chores", outcome)
+    return result
+
 @router.patch("/{chore_id}", response_model=schemas.Chore)
-def update_chore(chore_id: str, chore_update: schemas.ChoreUpdate, db: Session = Depends(get_db)):
-    db_chore = db.query(models.Chore).filter(models.Chore.id == chore_id).first()
-    if not db_chore:
-        raise HTTPException(status_code=404, detail="Chore not found")
-    
-    update_data = chore_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_chore, key, value)
-    
-    db.commit()
-    db.refresh(db_chore)
+async def update_chore(chore_id: str, chore_update: schemas.ChoreUpdate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_chore = await session.get(models.Chore, chore_id)
+        if not db_chore:
+            raise HTTPException(status_code=404, detail="Chore not found")
+
+        update_data = chore_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_chore, key, value)
+        await session.flush()
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "chores")
+        return db_chore
+
+    db_chore = await run_write(db, write)
+    await change_feed.publish(ALL_HOUSEHOLDS, "chores", "updated", [db_chore.id])
     return db_chore
 
 @router.post("/{chore_id}/complete", response_model=schemas.Chore)
-def complete_chore(chore_id: str, db: Session = Depends(get_db)):
-    db_chore = db.query(models.Chore).filter(models.Chore.id == chore_id).first()
-    if not db_chore:
-        raise HTTPException(status_code=404, detail="Chore not found")
-    
-    db_chore.completed_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_chore)
+async def complete_chore(chore_id: str, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_chore = await session.get(models.Chore, chore_id)
+        if not db_chore:
+            raise HTTPException(status_code=404, detail="Chore not found")
+
+        db_chore.completed_at = datetime.utcnow()
+        await session.flush()
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "chores")
+        return db_chore
+
+    db_chore = await run_write(db, write)
+    await change_feed.publish(ALL_HOUSEHOLDS, "chores", "updated", [db_chore.id])
     return db_chore
@@ -0,0 +1,36 @@
+import asyncio
+import json
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from app.services.change_feed import change_feed
+
+router = APIRouter()
+
+# Default household ID for demo purposes
+DEFAULT_HOUSEHOLD_ID = "default-household"
+# Comment line sent on idle streams so proxies keep the connection open
+HEARTBEAT_SECONDS = 15
+
+@router.get("/")
+async def stream_changes(household_id: str = DEFAULT_HOUSEHOLD_ID):
+    """Server-Sent Events stream of the household's changes.
+
+    Each `change` event carries {"resource", "action", "ids"}. After a
+    reconnect or a `resync` action, clients catch up through /sync.
+    """
+    async def stream():
+        async with change_feed.subscribe(household_id) as queue:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: change\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,50 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict
-from app.models.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Optional
+from app.models.database import get_async_db, get_read_db
+from app.models.write_queue import run_write
 from app.models import models, schemas
-from datetime import datetime
+from app.services import finance_rollups, resource_versions
+from app.services.cache import ALL_HOUSEHOLDS, response_cache
+from app.services.change_feed import change_feed
+from app.services.pagination import paginate
+from datetime import date, datetime
 
 router = APIRouter()
 
 @router.get("/transactions", response_model=List[schemas.FinancialTransaction])
-def list_transactions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    transactions = db.query(models.FinancialTransaction).order_by(models.FinancialTransaction.transaction_date.desc()).offset(skip).limit(limit).all()
-    return transactions
+async def list_transactions(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    unchanged = await resource_versions.not_modified(request, response, db, ALL_HOUSEHOLDS, "finance")
+    if unchanged:
+        return unchanged
+
+    stmt = select(models.FinancialTransaction)
+    return await paginate(
+        db,
+        stmt,
+        [models.FinancialTransaction.transaction_date, models.FinancialTransaction.id],
+        response, limit, skip, cursor, descending=True
+    )
 
 @router.post("/transactions", response_model=schemas.FinancialTransaction)
-def record_transaction(transaction: schemas.FinancialTransactionCreate, db: Session = Depends(get_db)):
-    household = db.query(models.Household).first()
-    if not household:
-        household = models.Household(name="Default Household")
-        db.add(household)
-        db.commit()
-        db.refresh(household)
-    
-    db_transaction = models.FinancialTransaction(**transaction.model_dump(), household_id=household.id)
-    db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+async def record_transaction(transaction: schemas.FinancialTransactionCreate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        household = await session.scalar(select(models.Household).limit(1))
+        if not household:
+            household = models.Household(name="Default Household")
+            session.add(household)
+            await session.flush()
+
+        db_transaction = models.FinancialTransaction(**transaction.model_dump(), household_id=household.id)
+        session.add(db_transaction)
+        await session.flush()
+        await session.run_sync(finance_rollups.apply_transaction, db_transaction)
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "finance")
+        return db_transaction
+
+    db_transaction = await run_write(db, write)
+    await response_cache.invalidate(ALL_HOUSEHOLDS, "finance")
+    await change_feed.publish(ALL_HOUSEHOLDS, "finance", "created", [db_transaction.id])
     return db_transaction
 
 @router.get("/summary", response_model=schemas.FinanceSummary)
-def get_finance_summary(db: Session = Depends(get_db)):
-    transactions = db.query(models.FinancialTransaction).all()
-    
-    total_expenses = sum(float(t.amount) for t in transactions if t.is_expense)
-    total_income = sum(float(t.amount) for t in transactions if not t.is_expense)
-    
-    category_breakdown = {}
-    for t in transactions:
-        cat = t.category or "Other"
-        amount = float(t.amount)
-        if t.is_expense:
-            category_breakdown[cat] = category_breakdown.get(cat, 0) + amount
-            
-    return schemas.FinanceSummary(
-        total_expenses=total_expenses,
-        total_income=total_income,
-        net_balance=total_income - total_expenses,
-        category_breakdown=category_breakdown
+async def get_finance_summary(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    unchanged = await resource_versions.not_modified(request, response, db, ALL_HOUSEHOLDS, "finance")
+    if unchanged:
+        return unchanged
+
+    async def load():
+        # Totals come from the monthly rollups, so the work is O(categories)
+        rows = (await db.execute(select(
+            models.FinanceRollup.category,
+            models.FinanceRollup.is_expense,
+            func.sum(models.FinanceRollup.total)
+        ).group_by(
+            models.FinanceRollup.category,
+            models.FinanceRollup.is_expense
+        ))).all()
+
+        total_expenses = 0.0
+        total_income = 0.0
+        category_breakdown = {}
+        for category, is_expense, amount in rows:
+            amount = float(amount or 0)
+            if is_expense:
+                total_expenses += amount
+                category_breakdown[category] = category_breakdown.get(category, 0) + amount
+            else:
+                total_income += amount
+
+        return schemas.FinanceSummary(
+            total_expenses=total_expenses,
+            total_income=total_income,
+            net_balance=total_income - total_expenses,
+            category_breakdown=category_breakdown
+        )
+
+    # Transactions are not filtered by household here, so the summary is cached for all of them.
+    # Keyed by version too, so a lagging replica cannot cache an older summary under it
+    params = {"view": "summary", "etag": response.headers["ETag"]}
+    return await response_cache.cached(ALL_HOUSEHOLDS, "finance", params, load)
+
+@router.get("/series", response_model=schemas.FinanceSeries)
+async def get_finance_series(
+    start_date: date,
+    end_date: date,
+    granularity: str = "month",
+    by_category: bool = False,
+    db: AsyncSession = Depends(get_read_db)
+):
+    if granularity not in finance_rollups.GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be one of: day, week, month")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
+    points = await db.run_sync(finance_rollups.build_series, start_date, end_date, granularity, by_category)
+    return schemas.FinanceSeries(
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+        points=points
     )
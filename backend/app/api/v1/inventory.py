@@ -1,50 +1,206 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.models.database import get_async_db, get_read_db
+from app.models.write_queue import run_write
 from app.models import models, schemas
+from app.services import batch_mutations, inventory_forecast, inventory_ledger, resource_versions
+from app.services.cache import ALL_HOUSEHOLDS, response_cache
+from app.services.change_feed import change_feed
+from app.services.pagination import paginate
 from datetime import datetime
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.InventoryItem])
-def list_inventory(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    items = db.query(models.InventoryItem).offset(skip).limit(limit).all()
-    return items
+async def list_inventory(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    unchanged = await resource_versions.not_modified(request, response, db, ALL_HOUSEHOLDS, "inventory")
+    if unchanged:
+        return unchanged
+
+    stmt = select(models.InventoryItem)
+    return await paginate(db, stmt, [models.InventoryItem.name, models.InventoryItem.id], response, limit, skip, cursor)
 
 @router.post("/", response_model=schemas.InventoryItem)
-def add_inventory_item(item: schemas.InventoryItemCreate, db: Session = Depends(get_db)):
-    household = db.query(models.Household).first()
-    if not household:
-        household = models.Household(name="Default Household")
-        db.add(household)
-        db.commit()
-        db.refresh(household)
-    
-    db_item = models.InventoryItem(**item.model_dump(), household_id=household.id)
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+async def add_inventory_item(item: schemas.InventoryItemCreate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        household = await session.scalar(select(models.Household).limit(1))
+        if not household:
+            household = models.Household(name="Default Household")
+            session.add(household)
+            await session.flush()
+
+        db_item = models.InventoryItem(**item.model_dump(), household_id=household.id)
+        session.add(db_item)
+        await session.flush()
+        await session.run_sync(inventory_ledger.record_opening, [db_item])
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "inventory")
+        return db_item
+
+    db_item = await run_write(db, write)
+    await response_cache.invalidate(ALL_HOUSEHOLDS, "inventory")
+    await change_feed.publish(ALL_HOUSEHOLDS, "inventory", "created", [db_item.id])
     return db_item
 
+@router.post("/batch", response_model=schemas.InventoryItemBatchResult)
+async def batch_update_inventory(batch: schemas.InventoryItemBatch, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        owner_id = None
+        if batch.create:
+            household = await session.scalar(select(models.Household).limit(1))
+            if not household:
+                household = models.Household(name="Default Household")
+                session.add(household)
+                await session.flush()
+            owner_id = household.id
+
+        # Quantities only change through the ledger: a new absolute quantity becomes an adjustment
+        adjustments, rethresholded = [], []
+        # The item is not written until the ledger runs, so repeated updates of one item
+        # in a batch are measured against the quantity its earlier update set
+        quantities = {}
+        def take_quantity(change, db_item):
+            if "quantity" in change:
+                quantity = change.pop("quantity") or 0
+                delta = quantity - quantities.get(db_item.id, db_item.quantity or 0)
+                quantities[db_item.id] = quantity
+                if delta:
+                    adjustments.append({"item_id": db_item.id, "delta": delta, "reason": "adjust"})
+            if "low_stock_threshold" in change:
+                rethresholded.append(db_item.id)
+
+        outcome = await session.run_sync(
+            batch_mutations.apply_batch,
+            models.InventoryItem,
+            "inventory",
+            ALL_HOUSEHOLDS,
+            owner_id,
+            [item.model_dump() for item in batch.create],
+            [change.model_dump(exclude_unset=True) for change in batch.update],
+            batch.delete,
+            on_update=take_quantity
+        )
+        created = (await session.scalars(select(models.InventoryItem).where(
+            models.InventoryItem.id.in_(outcome["created"])
+        ))).all()
+        await session.run_sync(inventory_ledger.record_opening, created)
+        moved = await session.run_sync(
+            inventory_ledger.apply_movements,
+            adjustments + [movement.model_dump() for movement in batch.movements]
+        )
+        outcome["results"] += moved
+        outcome["updated"] = list(dict.fromkeys(
+            outcome["updated"] + [result["id"] for result in moved if result["status"] == 200]
+        ))
+        # Moved items were refreshed by the ledger; the threshold feeds the reorder suggestion
+        rethresholded = set(rethresholded) - {result["id"] for result in moved if result["status"] == 200}
+        if rethresholded:
+            await session.run_sync(inventory_forecast.refresh, models.InventoryItem.id.in_(rethresholded))
+
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "inventory")
+        items = (await session.scalars(select(models.InventoryItem).where(
+            models.InventoryItem.id.in_(outcome["created"] + outcome["updated"])
+        ).execution_options(populate_existing=True))).all()
+        return outcome, schemas.InventoryItemBatchResult(results=outcome["results"], items=items)
+
+    outcome, result = await run_write(db, write)
+    await response_cache.invalidate(ALL_HOUSEHOLDS, "inventory")
+    await change_feed.publish_batch(ALL_HOUSEHOLDS, "inventory", outcome)
+    return result
+
 @router.patch("/{item_id}", response_model=schemas.InventoryItem)
-def update_inventory_item(item_id: str, item_update: schemas.InventoryItemUpdate, db: Session = Depends(get_db)):
-    db_item = db.query(models.InventoryItem).filter(models.InventoryItem.id == item_id).first()
-    if not db_item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    update_data = item_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_item, key, value)
-    
-    db_item.last_updated = datetime.utcnow()
-    db.commit()
-    db.refresh(db_item)
+async def update_inventory_item(item_id: str, item_update: schemas.InventoryItemUpdate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_item = await session.get(models.InventoryItem, item_id)
+        if not db_item:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        update_data = item_update.model_dump(exclude_unset=True)
+        # A new absolute quantity is recorded as an adjustment against the current one
+        quantity = update_data.pop("quantity", None)
+        for key, value in update_data.items():
+            setattr(db_item, key, value)
+
+        db_item.last_updated = datetime.utcnow()
+        await session.flush()
+        if quantity is not None and quantity != (db_item.quantity or 0):
+            await _move(session, item_id, {"delta": quantity - (db_item.quantity or 0), "reason": "adjust"})
+            await session.refresh(db_item)
+        elif "low_stock_threshold" in update_data:
+            # The threshold feeds the reorder suggestion; movements refresh the forecast themselves
+            await session.run_sync(inventory_forecast.refresh, models.InventoryItem.id == item_id)
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "inventory")
+        return db_item
+
+    db_item = await run_write(db, write)
+    await response_cache.invalidate(ALL_HOUSEHOLDS, "inventory")
+    await change_feed.publish(ALL_HOUSEHOLDS, "inventory", "updated", [db_item.id])
+    return db_item
+
+async def _move(session: AsyncSession, item_id: str, movement: dict) -> None:
+    [result] = await session.run_sync(inventory_ledger.apply_movements, [{"item_id": item_id, **movement}])
+    if result["status"] != 200:
+        raise HTTPException(status_code=result["status"], detail=result["detail"])
+
+@router.post("/{item_id}/movements", response_model=schemas.InventoryItem)
+async def record_movement(item_id: str, movement: schemas.InventoryMovementCreate, db: AsyncSession = Depends(get_async_db)):
+    """Change the stock by a delta; concurrent movements never overwrite each other."""
+    async def write(session):
+        await _move(session, item_id, movement.model_dump())
+        await session.run_sync(resource_versions.bump, ALL_HOUSEHOLDS, "inventory")
+        return await session.scalar(select(models.InventoryItem).where(
+            models.InventoryItem.id == item_id
+        ).execution_options(populate_existing=True))
+
+    db_item = await run_write(db, write)
+    await response_cache.invalidate(ALL_HOUSEHOLDS, "inventory")
+    await change_feed.publish(ALL_HOUSEHOLDS, "inventory", "updated", [db_item.id])
     return db_item
 
+@router.get("/{item_id}/movements", response_model=List[schemas.InventoryMovement])
+async def list_movements(
+    item_id: str,
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Movements still in the ledger, newest first; older ones are compacted into a snapshot."""
+    mv = models.InventoryMovement
+    stmt = select(mv).where(mv.item_id == item_id)
+    return await paginate(db, stmt, [mv.created_at, mv.id], response, limit, cursor=cursor, descending=True)
+
+@router.get("/forecast", response_model=List[schemas.InventoryForecast])
+async def get_forecast(limit: int = 100, reorder_only: bool = False, db: AsyncSession = Depends(get_read_db)):
+    """Projected run-out dates and reorder suggestions, soonest first.
+
+    Forecasts are kept current by stock movements and the nightly task.
+    Items without consumption in the forecast window are left out; see
+    /low-stock for what is already short.
+    """
+    return await db.run_sync(inventory_forecast.upcoming, limit, reorder_only)
+
 @router.get("/low-stock", response_model=List[schemas.InventoryItem])
-def get_low_stock(db: Session = Depends(get_db)):
-    items = db.query(models.InventoryItem).filter(
-        models.InventoryItem.quantity <= models.InventoryItem.low_stock_threshold
-    ).all()
-    return items
+async def get_low_stock(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    unchanged = await resource_versions.not_modified(request, response, db, ALL_HOUSEHOLDS, "inventory")
+    if unchanged:
+        return unchanged
+
+    async def load():
+        items = (await db.scalars(select(models.InventoryItem).where(
+            models.InventoryItem.quantity <= models.InventoryItem.low_stock_threshold
+        ))).all()
+        return [schemas.InventoryItem.model_validate(item) for item in items]
+
+    # Inventory is not filtered by household here, so the list is cached for all of them.
+    # Keyed by version too, so a lagging replica cannot cache an older list under it
+    params = {"view": "low-stock", "etag": response.headers["ETag"]}
+    return await response_cache.cached(ALL_HOUSEHOLDS, "inventory", params, load)
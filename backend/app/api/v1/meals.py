@@ -1,9 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timedelta
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from datetime import date, datetime
 from app.models import models, schemas
-from app.models.database import get_db
+from app.models.database import get_async_db, get_read_db
+from app.models.write_queue import run_write
+from app.services import (
+    ingredient_index, meal_planner, nutrition_rollups, plan_cloning, recipe_import, recipe_indexes,
+    batch_mutations, recipe_search, recipe_tags, resource_versions, shopping_list, sync,
+)
+from app.services.cache import ALL_HOUSEHOLDS, response_cache
+from app.services.change_feed import change_feed
+from app.services.pagination import paginate
+from app.tasks import meal_planning
 
 router = APIRouter()
 
@@ -12,356 +24,588 @@ DEFAULT_HOUSEHOLD_ID = "default-household"
 
 # Recipe endpoints
 @router.post("/recipes", response_model=schemas.Recipe)
-def create_recipe(recipe: schemas.RecipeCreate, db: Session = Depends(get_db)):
-    db_recipe = models.Recipe(
-        household_id=DEFAULT_HOUSEHOLD_ID,
-        **recipe.model_dump()
-    )
-    db.add(db_recipe)
-    db.commit()
-    db.refresh(db_recipe)
-    return db_recipe
+async def create_recipe(recipe: schemas.RecipeCreate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        if await session.run_sync(recipe_import.name_taken, DEFAULT_HOUSEHOLD_ID, recipe.name, recipe.category):
+            raise HTTPException(status_code=409, detail="A recipe with this name and category already exists")
+        db_recipe = models.Recipe(
+            household_id=DEFAULT_HOUSEHOLD_ID,
+            **recipe.model_dump()
+        )
+        session.add(db_recipe)
+        await session.flush()
+        await session.run_sync(recipe_indexes.refresh, [db_recipe.id])
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+        return db_recipe
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "recipes", "created", [result.id])
+    return result
+
+@router.post("/recipes/bulk", response_model=schemas.RecipeImportResult)
+async def bulk_import_recipes(recipes: List[schemas.RecipeCreate], db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        # One transaction: a failing request leaves no chunk behind. Unset
+        # fields are left out so updating an existing recipe keeps them
+        return await session.run_sync(
+            recipe_import.import_recipes,
+            DEFAULT_HOUSEHOLD_ID,
+            (recipe.model_dump(exclude_unset=True) for recipe in recipes)
+        )
+
+    counts = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "recipes", "updated")
+    return schemas.RecipeImportResult(**counts)
 
 @router.get("/recipes", response_model=List[schemas.Recipe])
-def get_recipes(
+async def get_recipes(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
-    db: Session = Depends(get_db)
+    tag: Optional[str] = None,
+    ingredient: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    query = db.query(models.Recipe).filter(
-        models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    )
-    if category:
-        query = query.filter(models.Recipe.category == category)
-    recipes = query.offset(skip).limit(limit).all()
-    return recipes
+    unchanged = await resource_versions.not_modified(request, response, db, DEFAULT_HOUSEHOLD_ID, "recipes")
+    if unchanged:
+        return unchanged
+
+    async def load():
+        stmt = select(models.Recipe).where(
+            models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
+        )
+        if category:
+            stmt = stmt.where(models.Recipe.category == category)
+        if tag:
+            stmt = stmt.where(models.Recipe.id.in_(
+                select(models.RecipeTag.recipe_id).where(
+                    models.RecipeTag.household_id == DEFAULT_HOUSEHOLD_ID,
+                    models.RecipeTag.tag == recipe_tags.normalize_tag(tag)
+                )
+            ))
+        if ingredient:
+            stmt = stmt.where(models.Recipe.id.in_(
+                select(models.RecipeIngredient.recipe_id).where(
+                    models.RecipeIngredient.household_id == DEFAULT_HOUSEHOLD_ID,
+                    models.RecipeIngredient.normalized_name == ingredient_index.normalize_name(ingredient)
+                )
+            ))
+        recipes = await paginate(db, stmt, [models.Recipe.created_at, models.Recipe.id], response, limit, skip, cursor)
+        return [schemas.Recipe.model_validate(recipe) for recipe in recipes]
+
+    # Keyed by version too: writers outside this process (the importers) cannot invalidate it
+    params = {"skip": skip, "limit": limit, "category": category, "tag": tag,
+              "ingredient": ingredient, "cursor": cursor, "etag": response.headers["ETag"]}
+    return await response_cache.cached(DEFAULT_HOUSEHOLD_ID, "recipes", params, load, response)
+
+@router.get("/recipes/search", response_model=List[schemas.Recipe])
+async def search_recipes(q: str, limit: int = 20, db: AsyncSession = Depends(get_read_db)):
+    return await db.run_sync(recipe_search.search, DEFAULT_HOUSEHOLD_ID, q, limit)
+
+@router.get("/recipes/pantry-match", response_model=List[schemas.PantryMatch])
+async def match_recipes_to_pantry(
+    limit: int = 20,
+    min_coverage: float = 0.0,
+    db: AsyncSession = Depends(get_read_db)
+):
+    pantry = (await db.scalars(select(models.InventoryItem.name).where(
+        models.InventoryItem.quantity > 0
+    ))).all()
+    return await db.run_sync(ingredient_index.match_pantry, DEFAULT_HOUSEHOLD_ID, pantry, limit, min_coverage)
 
 @router.get("/recipes/{recipe_id}", response_model=schemas.Recipe)
-def get_recipe(recipe_id: str, db: Session = Depends(get_db)):
-    recipe = db.query(models.Recipe).filter(
+async def get_recipe(recipe_id: str, db: AsyncSession = Depends(get_read_db)):
+    recipe = await db.scalar(select(models.Recipe).where(
         models.Recipe.id == recipe_id,
         models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
+    ).limit(1))
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     return recipe
 
 @router.put("/recipes/{recipe_id}", response_model=schemas.Recipe)
-def update_recipe(
+async def update_recipe(
     recipe_id: str,
     recipe_update: schemas.RecipeUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_recipe = db.query(models.Recipe).filter(
-        models.Recipe.id == recipe_id,
-        models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
-
-    update_data = recipe_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_recipe, field, value)
-
-    db.commit()
-    db.refresh(db_recipe)
-    return db_recipe
+    async def write(session):
+        db_recipe = await session.scalar(select(models.Recipe).where(
+            models.Recipe.id == recipe_id,
+            models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        update_data = recipe_update.model_dump(exclude_unset=True)
+        if "name" in update_data or "category" in update_data:
+            name = update_data.get("name", db_recipe.name)
+            category = update_data.get("category", db_recipe.category)
+            if await session.run_sync(recipe_import.name_taken, DEFAULT_HOUSEHOLD_ID, name, category, recipe_id):
+                raise HTTPException(status_code=409, detail="A recipe with this name and category already exists")
+        for field, value in update_data.items():
+            setattr(db_recipe, field, value)
+
+        await session.flush()
+        await session.run_sync(recipe_indexes.refresh, [db_recipe.id])
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+        return db_recipe
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "recipes", "updated", [result.id])
+    return result
 
 @router.delete("/recipes/{recipe_id}")
-def delete_recipe(recipe_id: str, db: Session = Depends(get_db)):
-    db_recipe = db.query(models.Recipe).filter(
-        models.Recipe.id == recipe_id,
-        models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
-
-    db.delete(db_recipe)
-    db.commit()
-    return {"message": "Recipe deleted successfully"}
+async def delete_recipe(recipe_id: str, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_recipe = await session.scalar(select(models.Recipe).where(
+            models.Recipe.id == recipe_id,
+            models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        await session.run_sync(
+            sync.record_deletes, "recipes", DEFAULT_HOUSEHOLD_ID, models.Recipe, models.Recipe.id == recipe_id
+        )
+        # The delete unlinks the recipe's plans, so their days are looked up first
+        planned = await session.run_sync(nutrition_rollups.planned_days, [recipe_id])
+        await session.delete(db_recipe)
+        await session.flush()
+        await session.run_sync(recipe_indexes.refresh, [recipe_id])
+        for household_id, days in planned.items():
+            await session.run_sync(nutrition_rollups.refresh_days, household_id, days)
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+        return {"message": "Recipe deleted successfully"}
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "recipes", "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "recipes", "deleted", [recipe_id])
+    return result
 
 # Meal Plan endpoints
 @router.post("/meal-plans", response_model=schemas.MealPlan)
-def create_meal_plan(meal_plan: schemas.MealPlanCreate, db: Session = Depends(get_db)):
-    # Verify recipe exists
-    recipe = db.query(models.Recipe).filter(
-        models.Recipe.id == meal_plan.recipe_id,
-        models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
-
-    db_meal_plan = models.MealPlan(
-        household_id=DEFAULT_HOUSEHOLD_ID,
-        **meal_plan.model_dump()
-    )
-    db.add(db_meal_plan)
-    db.commit()
-    db.refresh(db_meal_plan)
-    return db_meal_plan
+async def create_meal_plan(meal_plan: schemas.MealPlanCreate, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        # Verify recipe exists
+        recipe = await session.scalar(select(models.Recipe).where(
+            models.Recipe.id == meal_plan.recipe_id,
+            models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        db_meal_plan = models.MealPlan(
+            household_id=DEFAULT_HOUSEHOLD_ID,
+            **meal_plan.model_dump()
+        )
+        session.add(db_meal_plan)
+        await session.flush()
+        await session.run_sync(nutrition_rollups.refresh_days, DEFAULT_HOUSEHOLD_ID, [db_meal_plan.planned_date])
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+        return db_meal_plan
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "meal_plans", "created", [result.id])
+    return result
 
 @router.get("/meal-plans", response_model=List[schemas.MealPlanWithRecipe])
-def get_meal_plans(
+async def get_meal_plans(
+    request: Request,
+    response: Response,
     start_date: datetime = None,
     end_date: datetime = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    query = db.query(models.MealPlan).filter(
-        models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
-    )
+    unchanged = await resource_versions.not_modified(request, response, db, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    if unchanged:
+        return unchanged
 
-    if start_date:
-        query = query.filter(models.MealPlan.planned_date >= start_date)
-    if end_date:
-        query = query.filter(models.MealPlan.planned_date <= end_date)
+    async def load():
+        stmt = select(models.MealPlan).where(
+            models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
+        )
 
-    meal_plans = query.order_by(models.MealPlan.planned_date).all()
+        if start_date:
+            stmt = stmt.where(models.MealPlan.planned_date >= start_date)
+        if end_date:
+            stmt = stmt.where(models.MealPlan.planned_date <= end_date)
 
-    # Load recipes for each meal plan
-    result = []
-    for meal_plan in meal_plans:
-        # Skip meal plans with null recipe_id
-        if not meal_plan.recipe_id:
-            continue
+        # Load each plan together with its recipe in a single joined query
+        meal_plans = (await db.scalars(stmt.where(
+            models.MealPlan.recipe_id.isnot(None)
+        ).options(
+            joinedload(models.MealPlan.recipe)
+        ).order_by(models.MealPlan.planned_date))).all()
 
-        recipe = db.query(models.Recipe).filter(
-            models.Recipe.id == meal_plan.recipe_id
-        ).first()
-        meal_plan_dict = schemas.MealPlan.model_validate(meal_plan).model_dump()
-        meal_plan_dict['recipe'] = schemas.Recipe.model_validate(recipe) if recipe else None
-        result.append(schemas.MealPlanWithRecipe(**meal_plan_dict))
+        return [schemas.MealPlanWithRecipe.model_validate(meal_plan) for meal_plan in meal_plans]
 
-    return result
+    params = {"start_date": start_date, "end_date": end_date, "etag": response.headers["ETag"]}
+    return await response_cache.cached(DEFAULT_HOUSEHOLD_ID, "meal-plans", params, load)
 
 @router.get("/meal-plans/{meal_plan_id}", response_model=schemas.MealPlanWithRecipe)
-def get_meal_plan(meal_plan_id: str, db: Session = Depends(get_db)):
-    meal_plan = db.query(models.MealPlan).filter(
+async def get_meal_plan(meal_plan_id: str, db: AsyncSession = Depends(get_read_db)):
+    meal_plan = await db.scalar(select(models.MealPlan).options(
+        joinedload(models.MealPlan.recipe)
+    ).where(
         models.MealPlan.id == meal_plan_id,
         models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
+    ).limit(1))
     if not meal_plan:
         raise HTTPException(status_code=404, detail="Meal plan not found")
 
-    recipe = db.query(models.Recipe).filter(
-        models.Recipe.id == meal_plan.recipe_id
-    ).first()
-
-    meal_plan_dict = schemas.MealPlan.model_validate(meal_plan).model_dump()
-    meal_plan_dict['recipe'] = schemas.Recipe.model_validate(recipe) if recipe else None
-
-    return schemas.MealPlanWithRecipe(**meal_plan_dict)
+    return schemas.MealPlanWithRecipe.model_validate(meal_plan)
 
 @router.put("/meal-plans/{meal_plan_id}", response_model=schemas.MealPlan)
-def update_meal_plan(
+async def update_meal_plan(
     meal_plan_id: str,
     meal_plan_update: schemas.MealPlanUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_meal_plan = db.query(models.MealPlan).filter(
-        models.MealPlan.id == meal_plan_id,
-        models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_meal_plan:
-        raise HTTPException(status_code=404, detail="Meal plan not found")
-
-    update_data = meal_plan_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_meal_plan, field, value)
-
-    db.commit()
-    db.refresh(db_meal_plan)
-    return db_meal_plan
+    async def write(session):
+        db_meal_plan = await session.scalar(select(models.MealPlan).where(
+            models.MealPlan.id == meal_plan_id,
+            models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_meal_plan:
+            raise HTTPException(status_code=404, detail="Meal plan not found")
+
+        previous_date = db_meal_plan.planned_date
+        update_data = meal_plan_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_meal_plan, field, value)
+
+        await session.flush()
+        await session.run_sync(nutrition_rollups.refresh_days, DEFAULT_HOUSEHOLD_ID, [previous_date, db_meal_plan.planned_date])
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+        return db_meal_plan
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "meal_plans", "updated", [result.id])
+    return result
 
 @router.delete("/meal-plans/{meal_plan_id}")
-def delete_meal_plan(meal_plan_id: str, db: Session = Depends(get_db)):
-    db_meal_plan = db.query(models.MealPlan).filter(
-        models.MealPlan.id == meal_plan_id,
-        models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_meal_plan:
-        raise HTTPException(status_code=404, detail="Meal plan not found")
-
-    db.delete(db_meal_plan)
-    db.commit()
-    return {"message": "Meal plan deleted successfully"}
+async def delete_meal_plan(meal_plan_id: str, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_meal_plan = await session.scalar(select(models.MealPlan).where(
+            models.MealPlan.id == meal_plan_id,
+            models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_meal_plan:
+            raise HTTPException(status_code=404, detail="Meal plan not found")
+
+        await session.run_sync(
+            sync.record_deletes, "meal_plans", DEFAULT_HOUSEHOLD_ID, models.MealPlan, models.MealPlan.id == meal_plan_id
+        )
+        await session.delete(db_meal_plan)
+        await session.flush()
+        await session.run_sync(nutrition_rollups.refresh_days, DEFAULT_HOUSEHOLD_ID, [db_meal_plan.planned_date])
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+        return {"message": "Meal plan deleted successfully"}
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "meal_plans", "deleted", [meal_plan_id])
+    return result
 
 # Weekly meal plan generation
 @router.post("/meal-plans/generate-weekly")
-def generate_weekly_meal_plan(
+async def generate_weekly_meal_plan(
     request: schemas.WeeklyMealPlanRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    meal_types = ["breakfast", "lunch", "snack", "dinner"]
-    created_plans = []
+    async def write(session):
+        catalog = await session.run_sync(meal_planner.RecipeCatalog.load, DEFAULT_HOUSEHOLD_ID)
+        pantry = (await session.scalars(select(models.InventoryItem.name).where(
+            models.InventoryItem.quantity > 0
+        ))).all()
+        state = await session.run_sync(meal_planner.HouseholdState.load, catalog, DEFAULT_HOUSEHOLD_ID, pantry)
+
+        picks = meal_planner.plan_meals(
+            catalog, state, request.start_date, days=7 * request.weeks, preferences=request.preferences
+        )
+        rows = await session.run_sync(meal_planner.insert_plans, DEFAULT_HOUSEHOLD_ID, picks)
+        await session.run_sync(nutrition_rollups.refresh_days, DEFAULT_HOUSEHOLD_ID, {row["planned_date"] for row in rows})
+
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+        return {
+            "message": f"Generated {len(rows)} meal plans",
+            "plans": [schemas.MealPlan(**row) for row in rows]
+        }
+
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "meal_plans", "created", [plan.id for plan in result["plans"]])
+    return result
 
-    # Get all available recipes and categorize by meal type
-    all_recipes = db.query(models.Recipe).filter(
-        models.Recipe.household_id == DEFAULT_HOUSEHOLD_ID
-    ).all()
-
-    # Group recipes by category for better variety
-    recipes_by_category = {
-        "breakfast": [r for r in all_recipes if r.category == "breakfast"],
-        "lunch": [r for r in all_recipes if r.category == "lunch"],
-        "snack": [r for r in all_recipes if r.category == "snack"],
-        "dinner": [r for r in all_recipes if r.category == "dinner"],
-    }
-
-    # Track used recipes to avoid repetition
-    used_recipes = {mt: set() for mt in meal_types}
-
-    # Generate meal plans for 7 days
-    for day in range(7):
-        current_date = request.start_date + timedelta(days=day)
-
-        for meal_type in meal_types:
-            # Get available recipes for this meal type
-            available_recipes = recipes_by_category.get(meal_type, [])
-
-            # If no category-specific recipes, use any recipe
-            if not available_recipes:
-                available_recipes = all_recipes
-
-            # Filter out already used recipes for variety
-            unused_recipes = [r for r in available_recipes if r.id not in used_recipes[meal_type]]
-
-            # If all recipes used, reset the used set for this meal type
-            if not unused_recipes:
-                used_recipes[meal_type] = set()
-                unused_recipes = available_recipes
-
-            if not unused_recipes:
-                continue
-
-            # Select recipe (use index-based selection with variety)
-            recipe_index = day % len(unused_recipes)
-            recipe = unused_recipes[recipe_index]
-            used_recipes[meal_type].add(recipe.id)
-
-            # Create meal plan with appropriate hour
-            hour = 8 if meal_type == "breakfast" else 12 if meal_type == "lunch" else 15 if meal_type == "snack" else 18
-            meal_plan = models.MealPlan(
-                household_id=DEFAULT_HOUSEHOLD_ID,
-                recipe_id=recipe.id,
-                meal_type=meal_type,
-                planned_date=current_date.replace(hour=hour, minute=0, second=0)
-            )
-            db.add(meal_plan)
-            created_plans.append(meal_plan)
+@router.post("/meal-plans/generate-batch", response_model=schemas.AgentTaskStatus, status_code=202)
+async def generate_batch_meal_plans(
+    request: schemas.BatchMealPlanRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def write(session):
+        return await session.run_sync(
+            meal_planning.create_task,
+            request.start_date,
+            request.weeks,
+            household_ids=request.household_ids,
+            preferences=request.preferences,
+            catalog_household_id=DEFAULT_HOUSEHOLD_ID
+        )
+
+    task = await run_write(db, write)
+    background_tasks.add_task(_run_batch_plan, task.id)
+    return task
+
+async def _run_batch_plan(task_id: str):
+    await run_in_threadpool(meal_planning.run_batch_plan, task_id)
+    # The job may plan any household
+    await response_cache.invalidate(None, "meal-plans")
+    await change_feed.publish(ALL_HOUSEHOLDS, "meal_plans", "created")
+
+@router.post("/meal-plans/clone")
+async def clone_meal_plans(request: schemas.MealPlanCloneRequest, db: AsyncSession = Depends(get_async_db)):
+    if request.source_end < request.source_start:
+        raise HTTPException(status_code=400, detail="source_end must not be before source_start")
+
+    async def write(session):
+        created = await session.run_sync(
+            plan_cloning.clone_plans,
+            DEFAULT_HOUSEHOLD_ID,
+            request.source_start,
+            request.source_end,
+            request.target_start,
+            replace_existing=request.replace_existing
+        )
+        await session.run_sync(
+            nutrition_rollups.refresh_range,
+            DEFAULT_HOUSEHOLD_ID,
+            request.target_start,
+            request.target_start + (request.source_end - request.source_start)
+        )
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "meal-plans")
+        return {"message": f"Copied {created} meal plans", "created": created}
 
-    db.commit()
-    for plan in created_plans:
-        db.refresh(plan)
+    result = await run_write(db, write)
+    await response_cache.invalidate(DEFAULT_HOUSEHOLD_ID, "meal-plans")
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "meal_plans", "created")
+    return result
 
-    return {
-        "message": f"Generated {len(created_plans)} meal plans",
-        "plans": [schemas.MealPlan.model_validate(p) for p in created_plans]
-    }
+@router.get("/nutrition", response_model=schemas.NutritionSummary)
+async def get_nutrition(
+    start_date: date,
+    end_date: date,
+    granularity: str = "day",
+    db: AsyncSession = Depends(get_read_db)
+):
+    if granularity not in nutrition_rollups.GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be one of: day, week")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
+    return schemas.NutritionSummary(
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+        points=await db.run_sync(nutrition_rollups.series, DEFAULT_HOUSEHOLD_ID, start_date, end_date, granularity)
+    )
 
 # Shopping List endpoints
 @router.get("/shopping-list", response_model=List[schemas.ShoppingListItem])
-def get_shopping_list(
+async def get_shopping_list(
+    request: Request,
+    response: Response,
     include_purchased: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    query = db.query(models.ShoppingListItem).filter(
+    unchanged = await resource_versions.not_modified(request, response, db, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+    if unchanged:
+        return unchanged
+
+    stmt = select(models.ShoppingListItem).where(
         models.ShoppingListItem.household_id == DEFAULT_HOUSEHOLD_ID
     )
 
     if not include_purchased:
-        query = query.filter(models.ShoppingListItem.is_purchased == False)
+        stmt = stmt.where(models.ShoppingListItem.is_purchased == False)
 
-    items = query.order_by(models.ShoppingListItem.created_at.desc()).all()
+    items = (await db.scalars(stmt.order_by(models.ShoppingListItem.created_at.desc()))).all()
     return items
 
 @router.post("/shopping-list", response_model=schemas.ShoppingListItem)
-def add_shopping_list_item(
+async def add_shopping_list_item(
     item: schemas.ShoppingListItemCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_item = models.ShoppingListItem(
-        household_id=DEFAULT_HOUSEHOLD_ID,
-        **item.model_dump()
-    )
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
-    return db_item
+    async def write(session):
+        db_item = models.ShoppingListItem(
+            household_id=DEFAULT_HOUSEHOLD_ID,
+            **item.model_dump()
+        )
+        session.add(db_item)
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        return db_item
+
+    result = await run_write(db, write)
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "shopping_list", "created", [result.id])
+    return result
+
+@router.patch("/shopping-list/batch", response_model=schemas.ShoppingListItemBatchResult)
+async def batch_update_shopping_list(
+    batch: schemas.ShoppingListItemBatch,
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def write(session):
+        outcome = await session.run_sync(
+            batch_mutations.apply_batch,
+            models.ShoppingListItem,
+            "shopping_list",
+            DEFAULT_HOUSEHOLD_ID,
+            DEFAULT_HOUSEHOLD_ID,
+            [item.model_dump() for item in batch.create],
+            [change.model_dump(exclude_unset=True) for change in batch.update],
+            batch.delete,
+            on_update=shopping_list.stamp_purchased
+        )
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        items = (await session.scalars(select(models.ShoppingListItem).where(
+            models.ShoppingListItem.id.in_(outcome["created"] + outcome["updated"])
+        ).execution_options(populate_existing=True))).all()
+        return outcome, schemas.ShoppingListItemBatchResult(results=outcome["results"], items=items)
+
+    outcome, result = await run_write(db, write)
+    await change_feed.publish_batch(DEFAULT_HOUSEHOLD_ID, "shopping_list", outcome)
+    return result
 
 @router.put("/shopping-list/{item_id}", response_model=schemas.ShoppingListItem)
-def update_shopping_list_item(
+async def update_shopping_list_item(
     item_id: str,
     item_update: schemas.ShoppingListItemUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_item = db.query(models.ShoppingListItem).filter(
-        models.ShoppingListItem.id == item_id,
-        models.ShoppingListItem.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_item:
-        raise HTTPException(status_code=404, detail="Shopping list item not found")
-
-    update_data = item_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_item, field, value)
-
-    if update_data.get('is_purchased') and not db_item.purchased_at:
-        db_item.purchased_at = datetime.utcnow()
-
-    db.commit()
-    db.refresh(db_item)
-    return db_item
+    async def write(session):
+        db_item = await session.scalar(select(models.ShoppingListItem).where(
+            models.ShoppingListItem.id == item_id,
+            models.ShoppingListItem.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_item:
+            raise HTTPException(status_code=404, detail="Shopping list item not found")
+
+        update_data = item_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_item, field, value)
+
+        if update_data.get('is_purchased') and not db_item.purchased_at:
+            db_item.purchased_at = datetime.utcnow()
+
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        return db_item
+
+    result = await run_write(db, write)
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "shopping_list", "updated", [result.id])
+    return result
 
 @router.delete("/shopping-list/{item_id}")
-def delete_shopping_list_item(item_id: str, db: Session = Depends(get_db)):
-    db_item = db.query(models.ShoppingListItem).filter(
-        models.ShoppingListItem.id == item_id,
-        models.ShoppingListItem.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not db_item:
-        raise HTTPException(status_code=404, detail="Shopping list item not found")
+async def delete_shopping_list_item(item_id: str, db: AsyncSession = Depends(get_async_db)):
+    async def write(session):
+        db_item = await session.scalar(select(models.ShoppingListItem).where(
+            models.ShoppingListItem.id == item_id,
+            models.ShoppingListItem.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not db_item:
+            raise HTTPException(status_code=404, detail="Shopping list item not found")
+
+        await session.run_sync(
+            sync.record_deletes, "shopping_list", DEFAULT_HOUSEHOLD_ID, models.ShoppingListItem, models.ShoppingListItem.id == item_id
+        )
+        await session.delete(db_item)
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        return {"message": "Shopping list item deleted successfully"}
 
-    db.delete(db_item)
-    db.commit()
-    return {"message": "Shopping list item deleted successfully"}
+    result = await run_write(db, write)
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "shopping_list", "deleted", [item_id])
+    return result
 
 @router.post("/shopping-list/from-meal-plan/{meal_plan_id}")
-def generate_shopping_list_from_meal_plan(
+async def generate_shopping_list_from_meal_plan(
     meal_plan_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    meal_plan = db.query(models.MealPlan).filter(
-        models.MealPlan.id == meal_plan_id,
-        models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
-    ).first()
-    if not meal_plan:
-        raise HTTPException(status_code=404, detail="Meal plan not found")
+    async def write(session):
+        meal_plan = await session.scalar(select(models.MealPlan).where(
+            models.MealPlan.id == meal_plan_id,
+            models.MealPlan.household_id == DEFAULT_HOUSEHOLD_ID
+        ).limit(1))
+        if not meal_plan:
+            raise HTTPException(status_code=404, detail="Meal plan not found")
+
+        recipe = await session.scalar(select(models.Recipe).where(
+            models.Recipe.id == meal_plan.recipe_id
+        ).limit(1))
+        if not recipe or not recipe.ingredients:
+            raise HTTPException(status_code=404, detail="Recipe or ingredients not found")
+
+        created_items = []
+        for ingredient in recipe.ingredients:
+            item = models.ShoppingListItem(
+                household_id=DEFAULT_HOUSEHOLD_ID,
+                name=ingredient.get('name', ''),
+                quantity=ingredient.get('quantity', 1),
+                unit=ingredient.get('unit', ''),
+                category=ingredient.get('category', 'Other'),
+                added_from_recipe_id=recipe.id
+            )
+            session.add(item)
+            created_items.append(item)
+        await session.flush()
+
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        return {
+            "message": f"Added {len(created_items)} items to shopping list",
+            "items": [schemas.ShoppingListItem.model_validate(i) for i in created_items]
+        }
+
+    result = await run_write(db, write)
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "shopping_list", "created", [item.id for item in result["items"]])
+    return result
 
-    recipe = db.query(models.Recipe).filter(
-        models.Recipe.id == meal_plan.recipe_id
-    ).first()
-    if not recipe or not recipe.ingredients:
-        raise HTTPException(status_code=404, detail="Recipe or ingredients not found")
+@router.post("/shopping-list/from-meal-plans")
+async def generate_shopping_list_from_range(
+    request: schemas.ShoppingListRangeRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if request.end_date < request.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
 
-    created_items = []
-    for ingredient in recipe.ingredients:
-        item = models.ShoppingListItem(
-            household_id=DEFAULT_HOUSEHOLD_ID,
-            name=ingredient.get('name', ''),
-            quantity=ingredient.get('quantity', 1),
-            unit=ingredient.get('unit', ''),
-            category=ingredient.get('category', 'Other'),
-            added_from_recipe_id=recipe.id
+    async def write(session):
+        needs = await session.run_sync(
+            shopping_list.planned_requirements, DEFAULT_HOUSEHOLD_ID, request.start_date, request.end_date
         )
-        db.add(item)
-        created_items.append(item)
+        if request.subtract_inventory:
+            await session.run_sync(shopping_list.subtract_inventory, needs)
 
-    db.commit()
-    for item in created_items:
-        db.refresh(item)
+        created_ids, updated_ids = await session.run_sync(shopping_list.merge_into_list, DEFAULT_HOUSEHOLD_ID, needs)
 
-    return {
-        "message": f"Added {len(created_items)} items to shopping list",
-        "items": [schemas.ShoppingListItem.model_validate(i) for i in created_items]
-    }
+        # Bulk UPDATEs bypass the identity map, so reload the merged items
+        items = (await session.scalars(select(models.ShoppingListItem).where(
+            models.ShoppingListItem.id.in_(created_ids + updated_ids)
+        ).order_by(models.ShoppingListItem.name).execution_options(populate_existing=True))).all()
+
+        await session.run_sync(resource_versions.bump, DEFAULT_HOUSEHOLD_ID, "shopping-list")
+        return {
+            "message": f"Added {len(created_ids)} and updated {len(updated_ids)} shopping list items",
+            "items": [schemas.ShoppingListItem.model_validate(i) for i in items]
+        }
+
+    result = await run_write(db, write)
+    await change_feed.publish(DEFAULT_HOUSEHOLD_ID, "shopping_list", "updated", [item.id for item in result["items"]])
+    return result
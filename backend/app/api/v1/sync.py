@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.models.database import get_async_db
+from app.models import schemas
+from app.services import sync
+from datetime import datetime
+
+router = APIRouter()
+
+# Default household ID for demo purposes
+DEFAULT_HOUSEHOLD_ID = "default-household"
+
+# Reads the primary: a lagging replica could miss rows older than the watermark handed out
+@router.get("/", response_model=schemas.SyncChanges)
+async def sync_changes(since: Optional[datetime] = None, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(sync.changes, DEFAULT_HOUSEHOLD_ID, since)
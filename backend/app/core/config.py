@@ -7,9 +7,27 @@ class Settings(BaseSettings):
     
     # DATABASE
     DATABASE_URL: str = "sqlite:///./picke.db"
+    DATABASE_READ_URLS: str = ""  # comma-separated read replicas used by GET handlers
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    SQLITE_PRODUCTION: bool = False  # WAL + tuned pragmas + single group-committing writer
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_WRITE_BATCH_SIZE: int = 64  # most writes committed together by the writer
     
     # REDIS
     REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 1024  # in-process fallback when Redis is unavailable
+    
+    # INVENTORY
+    INVENTORY_LEDGER_RETENTION_DAYS: int = 90  # movements older than this are compacted into snapshots
+    INVENTORY_FORECAST_WINDOW_DAYS: int = 28  # consumption history behind each forecast; keep below the retention
+    INVENTORY_REORDER_COVER_DAYS: int = 14  # days of use a suggested reorder should cover
     
     # SECURITY
     SECRET_KEY: str = "CHANGEME_SUPER_SECRET_KEY"  # In production, use a strong secret
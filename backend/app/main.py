@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import agents, chores, inventory, finance, meals
+from app.api.v1 import agents, chores, events, inventory, finance, meals, sync
 
 app = FastAPI(
     title="PICK-E House Manager API",
@@ -15,6 +15,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Root endpoint
@@ -33,6 +34,8 @@ app.include_router(chores.router, prefix="/api/v1/chores", tags=["Chores"])
 app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["Inventory"])
 app.include_router(finance.router, prefix="/api/v1/finance", tags=["Finance"])
 app.include_router(meals.router, prefix="/api/v1/meals", tags=["Meals"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["Sync"])
+app.include_router(events.router, prefix="/api/v1/events", tags=["Events"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,16 +1,103 @@
-from sqlalchemy import create_engine
+import itertools
+from typing import List
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-if settings.DATABASE_URL.startswith("sqlite"):
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+# Production SQLite profile: WAL, tuned pragmas and a single group-committing writer
+SQLITE_PRODUCTION = IS_SQLITE and settings.SQLITE_PRODUCTION
+
+def sqlite_pragmas():
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+    ]
+
+def configure_sqlite(engine, begin: str = "BEGIN"):
+    """Apply the production pragmas on every new connection of a (sync) engine.
+
+    pysqlite/aiosqlite start transactions lazily and do not support
+    SAVEPOINT reliably, so the driver's own transaction handling is
+    turned off and SQLAlchemy emits `begin` itself; the writer engine
+    uses BEGIN IMMEDIATE to take the write lock up front.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql(begin)
+
+def pool_options(url: str) -> dict:
+    """Pool settings from the environment; in-memory SQLite keeps its single-connection pool."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+    if make_url(url).database not in (None, "", ":memory:"):
+        options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+    return options
+
+def read_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_READ_URLS.split(",") if url.strip()]
+
+if IS_SQLITE:
     engine = create_engine(
-        settings.DATABASE_URL, connect_args={"check_same_thread": False}
+        settings.DATABASE_URL, connect_args={"check_same_thread": False},
+        **pool_options(settings.DATABASE_URL)
     )
 else:
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
+if SQLITE_PRODUCTION:
+    configure_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncio drivers used by the API; scripts and background jobs keep the sync engine
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL), **pool_options(settings.DATABASE_URL)
+)
+# Objects stay usable after commit; refreshing them must not trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Sessions of the single writer used by app.models.write_queue (production SQLite only)
+AsyncWriteSessionLocal = None
+if SQLITE_PRODUCTION:
+    configure_sqlite(async_engine.sync_engine)
+    async_write_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL), pool_size=1, max_overflow=0
+    )
+    configure_sqlite(async_write_engine.sync_engine, begin="BEGIN IMMEDIATE")
+    AsyncWriteSessionLocal = async_sessionmaker(async_write_engine, autoflush=False, expire_on_commit=False)
+
+# Read replicas from DATABASE_READ_URLS; read-only handlers are spread over them round-robin
+read_engines = [create_async_engine(async_database_url(url), **pool_options(url)) for url in read_urls()]
+for read_engine in read_engines:
+    if SQLITE_PRODUCTION:
+        configure_sqlite(read_engine.sync_engine)
+AsyncReadSessionLocals = [
+    async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False) for read_engine in read_engines
+]
+_read_sessions = itertools.cycle(AsyncReadSessionLocals or [AsyncSessionLocal])
+
 Base = declarative_base()
 
 def get_db():
@@ -19,3 +106,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db():
+    """Session for read-only handlers: a replica when configured, else the primary.
+
+    Replicas may lag behind the primary, so handlers that must see their
+    own writes, or that write anything, stay on get_async_db.
+    """
+    async with next(_read_sessions)() as db:
+        yield db
+
+def upsert_insert(db):
+    """Return the dialect-specific insert() construct that supports ON CONFLICT."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
@@ -1,9 +1,31 @@
-from app.models.database import engine, Base
+from sqlalchemy.schema import CreateIndex
+from app.models.database import engine, Base, SessionLocal
 from app.models.models import *  # Import all models to register them with Base
+from app.models.migrations import add_missing_columns, run_migrations
+from app.services import recipe_search
 
 def init_db():
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        add_missing_columns(conn)
+
+    # Full-text search index lives outside the ORM metadata
+    db = SessionLocal()
+    try:
+        recipe_search.create_index(db)
+        db.commit()
+        run_migrations(db)
+    finally:
+        db.close()
+
+    # create_all skips indexes on tables that already exist; IF NOT EXISTS rather
+    # than checkfirst, which cannot see expression indexes such as lower(name).
+    # Built after the migrations, which merge rows a unique index would reject.
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+Data migrations applied by init_db, each recorded once in schema_migrations.
+
+New tables and indexes come from the ORM metadata; migrations here only
+cover what create_all cannot do on an existing database, such as
+backfilling derived rows. Columns added to existing tables are created by
+add_missing_columns before the migrations run, and init_db builds the
+indexes after them, so a migration can clear the way for a unique index.
+"""
+from datetime import datetime
+from sqlalchemy import Connection, and_, delete, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+from app.models import models
+from app.models.database import Base
+
+
+def add_missing_columns(conn: Connection):
+    """ALTER TABLE ... ADD COLUMN for model columns an existing table lacks.
+
+    Only suits nullable columns without server defaults; their values are
+    filled in by a data migration below.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    quote = conn.dialect.identifier_preparer.quote
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            print(f"Adding column {table.name}.{column.name}...")
+            conn.exec_driver_sql(
+                f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} "
+                f"{column.type.compile(dialect=conn.dialect)}"
+            )
+
+
+def backfill_recipe_ingredients_and_tags(db: Session):
+    from app.services import ingredient_index, recipe_tags
+
+    ingredient_index.rebuild(db)
+    recipe_tags.rebuild(db)
+
+
+def backfill_nutrition_rollups(db: Session):
+    from app.services import nutrition_rollups
+
+    nutrition_rollups.rebuild(db)
+
+
+def backfill_finance_rollups(db: Session):
+    # Previously done lazily by the first /finance/summary request
+    from app.services import finance_rollups
+
+    finance_rollups.rebuild_rollups(db)
+
+
+def backfill_updated_at(db: Session):
+    # Best known change time: creation time, else now (inventory items keep last_updated)
+    now = datetime.utcnow()
+    for model in (models.Household, models.User, models.Chore,
+                  models.FinancialTransaction, models.Recipe, models.MealPlan, models.ShoppingListItem):
+        known = getattr(model, "created_at", None)
+        value = func.coalesce(known, now) if known is not None else now
+        db.execute(update(model).where(model.updated_at.is_(None)).values(updated_at=value))
+
+
+def open_inventory_ledger(db: Session):
+    # Opening "adjust" movements for the stock items already hold
+    from app.services import inventory_ledger
+
+    inventory_ledger.reconcile(db)
+
+
+def merge_duplicate_recipes(db: Session):
+    # Before init_db builds the unique (household, lower(name), category) index:
+    # plans of a duplicate move to the oldest recipe of its group, the rest go
+    from app.services import recipe_indexes, resource_versions, sync
+
+    recipe = models.Recipe
+    key = tuple(
+        column.label(name)
+        for column, name in zip(models.RECIPE_NAME_KEY, ("household_id", "name", "category"))
+    )
+    duplicated = select(*key).group_by(*key).having(func.count() > 1).subquery()
+    rows = db.execute(
+        select(recipe.id, *key)
+        .join(duplicated, and_(*(duplicated.c[column.name] == column for column in key)))
+        .order_by(*key, recipe.created_at, recipe.id)
+    ).all()
+
+    kept, merged = {}, {}
+    for recipe_id, *group in rows:
+        keep_id = kept.setdefault(tuple(group), recipe_id)
+        if keep_id != recipe_id:
+            merged[recipe_id] = (keep_id, group[0])
+    now = datetime.utcnow()
+    for recipe_id, (keep_id, household_id) in merged.items():
+        db.execute(update(models.MealPlan).where(models.MealPlan.recipe_id == recipe_id)
+                   .values(recipe_id=keep_id, updated_at=now))
+        sync.record_deletes(db, "recipes", household_id, recipe, recipe.id == recipe_id)
+    if merged:
+        db.execute(delete(recipe).where(recipe.id.in_(merged)))
+        recipe_indexes.refresh(db, list(merged) + list(kept.values()))
+        for household_id in {household_id for _, household_id in merged.values()}:
+            resource_versions.bump(db, household_id, "recipes", "meal-plans")
+    # Superseded by the unique index, which starts with the same columns
+    db.execute(text("DROP INDEX IF EXISTS ix_recipes_household_lower_name"))
+
+
+def drop_inventory_updated_at(db: Session):
+    # Inventory syncs on last_updated, which every write already stamped alongside updated_at
+    db.execute(text("DROP INDEX IF EXISTS ix_inventory_items_updated_at"))
+    columns = {column["name"] for column in inspect(db.connection()).get_columns("inventory_items")}
+    if "updated_at" in columns:
+        db.execute(text("ALTER TABLE inventory_items DROP COLUMN updated_at"))
+
+
+def build_inventory_forecasts(db: Session):
+    # Forecasts are only refreshed by writes and the nightly task, so build them once up front
+    from app.services import inventory_forecast
+
+    inventory_forecast.refresh_all(db)
+
+
+# Applied in order; never rename or reorder an entry once released
+MIGRATIONS = [
+    ("0001_backfill_recipe_ingredients_and_tags", backfill_recipe_ingredients_and_tags),
+    ("0002_backfill_nutrition_rollups", backfill_nutrition_rollups),
+    ("0003_backfill_finance_rollups", backfill_finance_rollups),
+    ("0004_backfill_updated_at", backfill_updated_at),
+    ("0005_open_inventory_ledger", open_inventory_ledger),
+    ("0006_merge_duplicate_recipes", merge_duplicate_recipes),
+    ("0007_drop_inventory_updated_at", drop_inventory_updated_at),
+    ("0008_build_inventory_forecasts", build_inventory_forecasts),
+]
+
+
+def run_migrations(db: Session):
+    applied = {name for (name,) in db.query(models.SchemaMigration.name)}
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        print(f"Applying migration {name}...")
+        migrate(db)
+        db.add(models.SchemaMigration(name=name))
+        db.commit()
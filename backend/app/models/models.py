@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, DECIMAL, Boolean, JSON
+from sqlalchemy import func, Column, Integer, Float, String, Date, DateTime, ForeignKey, Text, DECIMAL, Boolean, JSON, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -9,6 +9,7 @@ class Household(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     settings = Column(JSON, default={})
     
     users = relationship("User", back_populates="household")
@@ -24,11 +25,17 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     role = Column(String(50), default="member")
     preferences = Column(JSON, default={})
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     household = relationship("Household", back_populates="users")
 
 class Chore(Base):
     __tablename__ = "chores"
+    __table_args__ = (
+        Index("ix_chores_name_id", "name", "id"),
+        Index("ix_chores_household_due", "household_id", "due_date"),
+        Index("ix_chores_updated_at", "updated_at"),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     name = Column(String(255), nullable=False)
@@ -39,11 +46,26 @@ class Chore(Base):
     completed_at = Column(DateTime)
     trello_card_id = Column(String(255))
     points = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     household = relationship("Household", back_populates="chores")
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        Index("ix_inventory_items_name_id", "name", "id"),
+        Index("ix_inventory_items_household_name", "household_id", "name"),
+        # Sync watermark of inventory
+        Index("ix_inventory_items_last_updated", "last_updated"),
+        # Covers the in-stock lookups (quantity > 0) of pantry matching and shopping lists
+        Index("ix_inventory_items_in_stock", "quantity", "name", "unit"),
+        # Partial index holding only the low-stock rows, so /low-stock never scans the pantry
+        Index(
+            "ix_inventory_items_low_stock", "household_id", "name",
+            sqlite_where=text("quantity <= low_stock_threshold"),
+            postgresql_where=text("quantity <= low_stock_threshold"),
+        ),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     name = Column(String(255), nullable=False)
@@ -57,6 +79,43 @@ class InventoryItem(Base):
     
     household = relationship("Household", back_populates="inventory_items")
 
+class InventoryMovement(Base):
+    """Append-only stock change of an inventory item; quantity is the running total."""
+    __tablename__ = "inventory_movements"
+    __table_args__ = (
+        Index("ix_inventory_movements_item_created", "item_id", "created_at", "id"),
+        Index("ix_inventory_movements_household_created", "household_id", "created_at"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    household_id = Column(String(36), ForeignKey("households.id"))
+    item_id = Column(String(36), ForeignKey("inventory_items.id", ondelete="CASCADE"), nullable=False)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String(20), nullable=False)  # purchase, consume, expire, adjust
+    note = Column(String(255))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class InventorySnapshot(Base):
+    """Quantity of an item from movements compacted away up to as_of."""
+    __tablename__ = "inventory_snapshots"
+    item_id = Column(String(36), ForeignKey("inventory_items.id", ondelete="CASCADE"), primary_key=True)
+    household_id = Column(String(36), ForeignKey("households.id"))
+    quantity = Column(Integer, nullable=False, default=0)
+    as_of = Column(DateTime, nullable=False)
+
+class InventoryForecast(Base):
+    """Cached consumption forecast of an inventory item, refreshed by services/inventory_forecast."""
+    __tablename__ = "inventory_forecasts"
+    __table_args__ = (
+        Index("ix_inventory_forecasts_run_out_date", "run_out_date", "item_id"),
+        Index("ix_inventory_forecasts_computed_at", "computed_at"),
+    )
+    item_id = Column(String(36), ForeignKey("inventory_items.id", ondelete="CASCADE"), primary_key=True)
+    household_id = Column(String(36), ForeignKey("households.id"))
+    daily_rate = Column(Float, nullable=False, default=0.0)
+    run_out_date = Column(DateTime)  # None when nothing was consumed in the window
+    suggested_quantity = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False)
+
 class AgentTask(Base):
     __tablename__ = "agent_tasks"
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -71,6 +130,11 @@ class AgentTask(Base):
 
 class FinancialTransaction(Base):
     __tablename__ = "financial_transactions"
+    __table_args__ = (
+        Index("ix_financial_transactions_date_id", "transaction_date", "id"),
+        Index("ix_financial_transactions_household_date", "household_id", "transaction_date"),
+        Index("ix_financial_transactions_updated_at", "updated_at"),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     amount = Column(DECIMAL(10, 2), nullable=False)
@@ -79,9 +143,44 @@ class FinancialTransaction(Base):
     transaction_date = Column(DateTime, default=datetime.utcnow)
     recorded_by = Column(String(36), ForeignKey("users.id"))
     is_expense = Column(Boolean, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class FinanceRollup(Base):
+    """Per-household, per-category, per-month totals maintained on every write."""
+    __tablename__ = "finance_rollups"
+    __table_args__ = (
+        UniqueConstraint("household_id", "category", "period", "is_expense", name="uq_finance_rollup_bucket"),
+        # Lets the all-time summary aggregate straight from the index
+        Index("ix_finance_rollups_category_totals", "category", "is_expense", "total"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    household_id = Column(String(36), ForeignKey("households.id"))
+    category = Column(String(100), nullable=False)
+    period = Column(Date, nullable=False)  # First day of the month
+    is_expense = Column(Boolean, nullable=False)
+    total = Column(DECIMAL(14, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+class FinanceDailyRollup(Base):
+    """Per-household, per-category, per-day totals backing the finance series API."""
+    __tablename__ = "finance_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("household_id", "category", "period", "is_expense", name="uq_finance_daily_rollup_bucket"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    household_id = Column(String(36), ForeignKey("households.id"))
+    category = Column(String(100), nullable=False)
+    period = Column(Date, nullable=False)
+    is_expense = Column(Boolean, nullable=False)
+    total = Column(DECIMAL(14, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index("ix_recipes_household_created_id", "household_id", "created_at", "id"),
+        Index("ix_recipes_household_updated_at", "household_id", "updated_at"),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     name = Column(String(255), nullable=False)
@@ -95,12 +194,75 @@ class Recipe(Base):
     tags = Column(JSON, default=[])
     nutrition_info = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by = Column(String(36), ForeignKey("users.id"))
 
     meal_plans = relationship("MealPlan", back_populates="recipe")
 
+# One recipe per household, case-insensitive name and category: the recipe importers' upsert key.
+# The '' is a literal so that ON CONFLICT targets and lookups match the indexed expression.
+RECIPE_NAME_KEY = (Recipe.household_id, func.lower(Recipe.name), func.coalesce(Recipe.category, text("''")))
+Index("ux_recipes_household_name_category", *RECIPE_NAME_KEY, unique=True)
+
+class RecipeIngredient(Base):
+    """One row per recipe ingredient, keyed by normalized name for pantry lookups."""
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        Index("ix_recipe_ingredients_household_name", "household_id", "normalized_name", "recipe_id"),
+        Index("ix_recipe_ingredients_recipe", "recipe_id"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    recipe_id = Column(String(36), ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False)
+    household_id = Column(String(36), ForeignKey("households.id"))
+    position = Column(Integer, default=0)
+    name = Column(String(255), nullable=False)
+    normalized_name = Column(String(255), nullable=False)
+    quantity = Column(Float)
+    unit = Column(String(50))
+
+class RecipeTag(Base):
+    __tablename__ = "recipe_tags"
+    __table_args__ = (
+        UniqueConstraint("recipe_id", "tag", name="uq_recipe_tags_recipe_tag"),
+        Index("ix_recipe_tags_household_tag", "household_id", "tag", "recipe_id"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    recipe_id = Column(String(36), ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False)
+    household_id = Column(String(36), ForeignKey("households.id"))
+    tag = Column(String(100), nullable=False)
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+    name = Column(String(255), primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+class ResourceVersion(Base):
+    """Change counter of one resource list of a household, bumped by every write to it."""
+    __tablename__ = "resource_versions"
+    # household_id is "*" for lists that span every household, hence no foreign key
+    household_id = Column(String(36), primary_key=True)
+    resource = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class Tombstone(Base):
+    """Marker left by a delete so /sync can tell clients to drop the row."""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_household_deleted_at", "household_id", "deleted_at"),
+    )
+    resource = Column(String(50), primary_key=True)
+    record_id = Column(String(36), primary_key=True)
+    # "*" for resources that are not filtered by household, as in resource_versions
+    household_id = Column(String(36), nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
 class MealPlan(Base):
     __tablename__ = "meal_plans"
+    __table_args__ = (
+        Index("ix_meal_plans_recipe", "recipe_id"),
+        Index("ix_meal_plans_household_date", "household_id", "planned_date"),
+        Index("ix_meal_plans_household_updated_at", "household_id", "updated_at"),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     recipe_id = Column(String(36), ForeignKey("recipes.id"))
@@ -109,11 +271,28 @@ class MealPlan(Base):
     status = Column(String(50), default="planned")
     notes = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     recipe = relationship("Recipe", back_populates="meal_plans")
 
+class NutritionRollup(Base):
+    """Nutrition totals of a household's planned meals for one day."""
+    __tablename__ = "nutrition_rollups"
+    __table_args__ = (
+        UniqueConstraint("household_id", "day", name="uq_nutrition_rollup_day"),
+    )
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    household_id = Column(String(36), ForeignKey("households.id"))
+    day = Column(Date, nullable=False)
+    meal_count = Column(Integer, nullable=False, default=0)
+    totals = Column(JSON, default={})
+
 class ShoppingListItem(Base):
     __tablename__ = "shopping_list_items"
+    __table_args__ = (
+        Index("ix_shopping_list_items_household_purchased_created", "household_id", "is_purchased", "created_at"),
+        Index("ix_shopping_list_items_household_updated_at", "household_id", "updated_at"),
+    )
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     household_id = Column(String(36), ForeignKey("households.id"))
     name = Column(String(255), nullable=False)
@@ -126,3 +305,4 @@ class ShoppingListItem(Base):
     added_from_recipe_id = Column(String(36), ForeignKey("recipes.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     purchased_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Literal
 from uuid import UUID
 
 class HouseholdBase(BaseModel):
@@ -15,6 +15,15 @@ class Household(HouseholdBase):
     settings: Dict[str, Any]
     model_config = ConfigDict(from_attributes=True)
 
+# Upper bound on each list (create, update, delete) of a batch request
+MAX_BATCH_ITEMS = 500
+
+class BatchItemResult(BaseModel):
+    op: str
+    id: str
+    status: int
+    detail: Optional[str] = None
+
 class ChoreBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -40,8 +49,22 @@ class Chore(ChoreBase):
     assigned_to: Optional[str] = None
     completed_at: Optional[datetime] = None
     trello_card_id: Optional[str] = None
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
+class ChoreBatchUpdate(ChoreUpdate):
+    id: str
+
+class ChoreBatch(BaseModel):
+    create: List[ChoreCreate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    update: List[ChoreBatchUpdate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    delete: List[str] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+
+class ChoreBatchResult(BaseModel):
+    results: List[BatchItemResult]
+    # Current state of the created and updated rows
+    items: List[Chore]
+
 class InventoryItemBase(BaseModel):
     name: str
     category: Optional[str] = None
@@ -68,6 +91,47 @@ class InventoryItem(InventoryItemBase):
     last_updated: datetime
     model_config = ConfigDict(from_attributes=True)
 
+class InventoryMovementCreate(BaseModel):
+    delta: int
+    reason: Literal["purchase", "consume", "expire", "adjust"]
+    note: Optional[str] = Field(default=None, max_length=255)
+
+class InventoryMovement(InventoryMovementCreate):
+    id: str
+    item_id: str
+    household_id: Optional[str] = None
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class InventoryMovementBatchItem(InventoryMovementCreate):
+    item_id: str
+
+class InventoryForecast(BaseModel):
+    item_id: str
+    name: str
+    unit: Optional[str] = None
+    quantity: int
+    daily_rate: float
+    days_until_out: Optional[float] = None
+    run_out_date: Optional[datetime] = None
+    suggested_quantity: int
+    computed_at: datetime
+
+class InventoryItemBatchUpdate(InventoryItemUpdate):
+    id: str
+
+class InventoryItemBatch(BaseModel):
+    create: List[InventoryItemCreate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    update: List[InventoryItemBatchUpdate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    delete: List[str] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    # Stock changes applied atomically after the creates, updates and deletes
+    movements: List[InventoryMovementBatchItem] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+
+class InventoryItemBatchResult(BaseModel):
+    results: List[BatchItemResult]
+    # Current state of the created and updated rows
+    items: List[InventoryItem]
+
 class AgentRequest(BaseModel):
     prompt: str
     context: Dict[str, Any] = {}
@@ -91,6 +155,7 @@ class FinancialTransaction(FinancialTransactionBase):
     id: str
     household_id: str
     recorded_by: Optional[str] = None
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 class FinanceSummary(BaseModel):
@@ -99,6 +164,19 @@ class FinanceSummary(BaseModel):
     net_balance: float
     category_breakdown: Dict[str, float]
 
+class FinanceSeriesPoint(BaseModel):
+    period: date
+    category: Optional[str] = None
+    total_income: float
+    total_expenses: float
+    net_balance: float
+
+class FinanceSeries(BaseModel):
+    granularity: str
+    start_date: date
+    end_date: date
+    points: List[FinanceSeriesPoint]
+
 class RecipeBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -131,8 +209,32 @@ class Recipe(RecipeBase):
     household_id: str
     created_at: datetime
     created_by: Optional[str] = None
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
+class PantryMatch(BaseModel):
+    recipe: Recipe
+    coverage: float
+    matched_ingredients: List[str]
+    missing_ingredients: List[str]
+
+class NutritionPoint(BaseModel):
+    period: date
+    meal_count: int
+    totals: Dict[str, float]
+
+class NutritionSummary(BaseModel):
+    granularity: str
+    start_date: date
+    end_date: date
+    points: List[NutritionPoint]
+
+class RecipeImportResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    duplicates: int
+
 class MealPlanBase(BaseModel):
     recipe_id: str
     meal_type: str
@@ -154,6 +256,7 @@ class MealPlan(MealPlanBase):
     household_id: str
     status: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 class MealPlanWithRecipe(MealPlan):
@@ -187,9 +290,74 @@ class ShoppingListItem(ShoppingListItemBase):
     is_purchased: bool
     created_at: datetime
     purchased_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
+class ShoppingListItemBatchUpdate(ShoppingListItemUpdate):
+    id: str
+
+class ShoppingListItemBatch(BaseModel):
+    create: List[ShoppingListItemCreate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    update: List[ShoppingListItemBatchUpdate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    delete: List[str] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+
+class ShoppingListItemBatchResult(BaseModel):
+    results: List[BatchItemResult]
+    # Current state of the created and updated rows
+    items: List[ShoppingListItem]
+
+class MealPlanCloneRequest(BaseModel):
+    source_start: datetime
+    source_end: datetime
+    target_start: datetime
+    replace_existing: bool = False
+
+class BatchMealPlanRequest(BaseModel):
+    start_date: datetime
+    weeks: int = Field(default=1, ge=1, le=52)
+    household_ids: Optional[List[str]] = None
+    preferences: Optional[Dict[str, Any]] = {}
+
+class AgentTaskStatus(BaseModel):
+    id: str
+    agent_name: Optional[str] = None
+    task_type: Optional[str] = None
+    status: str
+    input_data: Optional[Dict[str, Any]] = None
+    output_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class ShoppingListRangeRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    subtract_inventory: bool = True
+
 class WeeklyMealPlanRequest(BaseModel):
     recipes: List[str]
     start_date: datetime
+    weeks: int = Field(default=1, ge=1, le=52)
     preferences: Optional[Dict[str, Any]] = {}
+
+class SyncTombstone(BaseModel):
+    resource: str
+    record_id: str
+    deleted_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncMealPlan(MealPlan):
+    # Null once the planned recipe has been deleted
+    recipe_id: Optional[str] = None
+
+class SyncChanges(BaseModel):
+    # Pass back as `since` on the next sync
+    watermark: datetime
+    chores: List[Chore] = []
+    inventory: List[InventoryItem] = []
+    finance: List[FinancialTransaction] = []
+    recipes: List[Recipe] = []
+    meal_plans: List[SyncMealPlan] = []
+    shopping_list: List[ShoppingListItem] = []
+    deleted: List[SyncTombstone] = []
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal, engine
 from app.models import models
+from app.services import finance_rollups, inventory_ledger
 from datetime import datetime, timedelta
 
 def seed_db():
@@ -40,6 +41,8 @@ def seed_db():
             models.InventoryItem(household_id=household.id, name="Bread", category="Bakery", quantity=1, unit="pcs", low_stock_threshold=1),
         ]
         db.add_all(items)
+        db.flush()
+        inventory_ledger.record_opening(db, items)
 
         # Create Transactions
         transactions = [
@@ -47,6 +50,9 @@ def seed_db():
             models.FinancialTransaction(household_id=household.id, amount=42.50, category="Groceries", description="Weekly veggies", is_expense=True),
         ]
         db.add_all(transactions)
+        db.flush()
+        for transaction in transactions:
+            finance_rollups.apply_transaction(db, transaction)
 
         db.commit()
         print("Database seeded successfully!")
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models import database
+
+WriteJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """Single writer that group-commits queued write jobs.
+
+    SQLite allows one writer at a time, so concurrent request sessions
+    writing directly contend for the lock and each pays its own fsync.
+    Here every job is queued and one worker drains whatever is waiting:
+    each job runs in its own SAVEPOINT on the writer session (a failing
+    job only rolls back itself and gets its exception back) and the
+    whole batch is committed once.
+    """
+
+    def __init__(self, session_factory, max_batch: int = 64):
+        self._session_factory = session_factory
+        self.max_batch = max_batch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, job: WriteJob) -> Any:
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((job, future))
+        return await future
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[Tuple[WriteJob, asyncio.Future]]) -> None:
+        outcomes = []
+        async with self._session_factory() as session:
+            try:
+                for job, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await job(session), None))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                await session.commit()
+            except Exception as exc:
+                # The batch as a whole failed to commit: every job fails with it
+                outcomes = [(future, None, exc) for future, _, _ in outcomes]
+                outcomes += [(future, None, exc) for _, future in batch[len(outcomes):]]
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_queue = (
+    WriteQueue(database.AsyncWriteSessionLocal, settings.SQLITE_WRITE_BATCH_SIZE)
+    if database.AsyncWriteSessionLocal is not None else None
+)
+
+
+async def run_write(db: AsyncSession, job: WriteJob) -> Any:
+    """Run a write job and commit it.
+
+    With the production SQLite profile the job goes through the shared
+    group-committing writer; otherwise it runs on the request's own
+    session, which is committed straight away.
+    """
+    if write_queue is not None:
+        return await write_queue.submit(job)
+    result = await job(db)
+    await db.commit()
+    return result
@@ -0,0 +1,92 @@
+"""
+Batched creates, updates and deletes of one resource in a single transaction.
+
+However many items a batch holds, it costs one SELECT of the referenced
+rows, one multi-row INSERT, one bulk UPDATE by primary key and one
+DELETE. Items naming rows that do not exist (or belong to another
+household) are reported with status 404 and skipped; the rest is
+applied together.
+"""
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.services import sync
+from app.services.cache import ALL_HOUSEHOLDS
+
+# Called with the changes of one update and the current row, may add fields to the changes
+UpdateHook = Callable[[Dict[str, Any], Any], None]
+
+
+def apply_batch(
+    db: Session,
+    model,
+    resource: str,
+    scope: str,
+    owner_id: str,
+    creates: List[Dict[str, Any]],
+    updates: List[Dict[str, Any]],
+    deletes: List[str],
+    on_update: Optional[UpdateHook] = None,
+) -> Dict[str, Any]:
+    """Apply a batch to `model`; `resource` names it in tombstones (see sync.RESOURCES).
+
+    Rows are looked up within household `scope` (ALL_HOUSEHOLDS: any
+    household); created rows belong to `owner_id`. Each update dict holds
+    the row id plus only the fields to change. Returns per-item results
+    in request order (creates, updates, deletes) and the affected ids.
+    The bulk UPDATE bypasses the identity map: reload updated rows with
+    populate_existing.
+    """
+    referenced = {change["id"] for change in updates} | set(deletes)
+    existing = {}
+    if referenced:
+        stmt = select(model).where(model.id.in_(referenced))
+        if scope != ALL_HOUSEHOLDS:
+            stmt = stmt.where(model.household_id == scope)
+        existing = {row.id: row for row in db.scalars(stmt)}
+
+    results: List[Dict[str, Any]] = []
+    created, updated, deleted = [], [], []
+
+    rows = [{"id": str(uuid.uuid4()), "household_id": owner_id, **fields} for fields in creates]
+    for row in rows:
+        created.append(row["id"])
+        results.append({"op": "create", "id": row["id"], "status": 200})
+
+    changes = []
+    for change in updates:
+        row = existing.get(change["id"])
+        if row is None:
+            results.append({"op": "update", "id": change["id"], "status": 404, "detail": "Not found"})
+            continue
+        change = dict(change)
+        if on_update is not None:
+            on_update(change, row)
+        if len(change) > 1:
+            changes.append(change)
+        updated.append(row.id)
+        results.append({"op": "update", "id": row.id, "status": 200})
+
+    for record_id in deletes:
+        if record_id not in existing:
+            results.append({"op": "delete", "id": record_id, "status": 404, "detail": "Not found"})
+            continue
+        deleted.append(record_id)
+        results.append({"op": "delete", "id": record_id, "status": 200})
+    deleted = list(dict.fromkeys(deleted))
+
+    if rows:
+        db.execute(insert(model), rows)
+    if changes:
+        db.execute(update(model), changes)
+    if deleted:
+        sync.record_deletes(db, resource, scope, model, model.id.in_(deleted))
+        db.execute(delete(model).where(model.id.in_(deleted)))
+
+    return {
+        "results": results,
+        "created": created,
+        "updated": list(dict.fromkeys(updated)),
+        "deleted": deleted,
+    }
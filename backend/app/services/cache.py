@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency; the in-process cache is used instead
+    redis = None
+
+KEY_PREFIX = "picke:cache"
+# Response headers stored alongside a cached body
+CACHED_HEADERS = (NEXT_CURSOR_HEADER,)
+# Scope for endpoints that aggregate over every household
+ALL_HOUSEHOLDS = "*"
+
+
+def resource_tags(scope: str, resource: str) -> List[str]:
+    """Tags of a cached entry: one per household and one spanning all households."""
+    return [f"{resource}@{scope}", resource]
+
+
+class MemoryBackend:
+    """Bounded in-process LRU with per-entry expiry and tag sets."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, tags: Iterable[str], ttl: int) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        # Keeps the tag sets from growing with keys that are long gone
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """Entries as JSON strings with a TTL; each tag is a Redis set of entry keys."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, tags: Iterable[str], ttl: int) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = f"{KEY_PREFIX}:tag:{tag}"
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl)
+        await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{KEY_PREFIX}:tag:{tag}"
+            keys = await self.client.smembers(tag_key)
+            await self.client.delete(tag_key, *keys)
+
+
+class ResponseCache:
+    """Cache for hot GET payloads, keyed per household and invalidated by tag.
+
+    Uses Redis (settings.REDIS_URL) when the client library is installed
+    and the server answers; otherwise an in-process LRU, which is only
+    invalidated by writes handled in the same process, so entries there
+    can be up to CACHE_TTL_SECONDS stale under multiple workers. Redis
+    errors after start-up degrade to cache misses rather than failures.
+    """
+
+    def __init__(self):
+        self._backend = None
+        self._loop = None
+        self._memory = MemoryBackend(settings.CACHE_MAX_ENTRIES)
+
+    async def backend(self):
+        loop = asyncio.get_running_loop()
+        # redis.asyncio connections belong to the event loop they were opened on
+        if self._backend is None or (isinstance(self._backend, RedisBackend) and self._loop is not loop):
+            self._loop = loop
+            self._backend = await self._connect()
+        return self._backend
+
+    async def _connect(self):
+        if redis is None or not settings.REDIS_URL:
+            return self._memory
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+        try:
+            await client.ping()
+        except (redis.RedisError, OSError):
+            print("Warning: Redis is not reachable, using the in-process response cache")
+            return self._memory
+        return RedisBackend(client)
+
+    @staticmethod
+    def key(scope: str, resource: str, **params) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{KEY_PREFIX}:{scope}:{resource}:{digest}"
+
+    async def cached(
+        self,
+        scope: str,
+        resource: str,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[Any]],
+        response: Optional[Response] = None,
+    ) -> Any:
+        """Return the cached payload for the request, or build it with `load` and cache it.
+
+        `load` must return something `jsonable_encoder` can serialize
+        (Pydantic schemas, not ORM objects); headers listed in
+        CACHED_HEADERS are replayed on hits.
+        """
+        if not settings.CACHE_ENABLED:
+            return await load()
+
+        key = self.key(scope, resource, **params)
+        backend = await self.backend()
+        try:
+            entry = await backend.get(key)
+        except Exception:
+            entry = None
+        if entry is not None:
+            if response is not None:
+                for name, value in entry["headers"].items():
+                    response.headers[name] = value
+            return entry["body"]
+
+        body = jsonable_encoder(await load())
+        headers = {
+            name: response.headers[name]
+            for name in CACHED_HEADERS
+            if response is not None and name in response.headers
+        }
+        try:
+            await backend.set(key, {"body": body, "headers": headers},
+                              resource_tags(scope, resource), settings.CACHE_TTL_SECONDS)
+        except Exception:
+            pass
+        return body
+
+    async def invalidate(self, scope: Optional[str], *resources: str) -> None:
+        """Drop cached entries of the resources for one household, or for all with scope None."""
+        if not settings.CACHE_ENABLED:
+            return
+        tags = [resource if scope is None else resource_tags(scope, resource)[0] for resource in resources]
+        if scope is not None and scope != ALL_HOUSEHOLDS:
+            # Cross-household aggregates include this household's rows too
+            tags += [resource_tags(ALL_HOUSEHOLDS, resource)[0] for resource in resources]
+        backend = await self.backend()
+        try:
+            await backend.invalidate(tags)
+        except Exception as e:
+            print(f"Warning: Could not invalidate cached {', '.join(resources)}: {e}")
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+from app.core.config import settings
+from app.services.cache import ALL_HOUSEHOLDS
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency; events then stay within this process
+    redis = None
+
+CHANNEL_PREFIX = "picke:events"
+# Events a subscriber may fall behind by before it is told to resync
+QUEUE_SIZE = 256
+# Sent when a subscriber's queue overflowed: fetch /sync instead of replaying events
+RESYNC = {"resource": None, "action": "resync", "ids": []}
+
+
+class ChangeFeed:
+    """Per-household fan-out of create/update/delete events to stream subscribers.
+
+    Subscribers are plain asyncio queues, so an idle connection costs one
+    queue and one suspended coroutine. With Redis reachable, events are
+    published to a channel per household and every process keeps a
+    single pattern subscription that feeds its local queues; otherwise
+    events only reach subscribers in the publishing process. Events with
+    the ALL_HOUSEHOLDS scope go to every subscriber.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop = None
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        # redis.asyncio connections belong to the event loop they were opened on
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._redis = None
+        if redis is None or not settings.REDIS_URL:
+            return
+        # No socket_timeout: the subscription blocks on reads for as long as nothing changes
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribed before anything is published from this process
+            await asyncio.wait_for(pubsub.psubscribe(f"{CHANNEL_PREFIX}:*"), timeout=0.5)
+        except (redis.RedisError, OSError, asyncio.TimeoutError):
+            print("Warning: Redis is not reachable, change events stay within this process")
+            return
+        self._redis = client
+        self._listener = loop.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                channel = message["channel"].decode()
+                self._deliver(channel[len(CHANNEL_PREFIX) + 1:], json.loads(message["data"]))
+        except (redis.RedisError, OSError) as e:
+            print(f"Warning: Lost the Redis change feed subscription, events stay within this process: {e}")
+            self._redis = None
+
+    def _deliver(self, household_id: str, event: Dict[str, Any]) -> None:
+        if household_id == ALL_HOUSEHOLDS:
+            targets = [queue for queues in self._subscribers.values() for queue in queues]
+        else:
+            targets = list(self._subscribers.get(household_id, ()))
+        for queue in targets:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client: drop its backlog rather than buffer without bound
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    async def publish(self, household_id: str, resource: str, action: str, ids: Iterable[str] = ()) -> None:
+        """Announce a committed change; empty ids mean "some rows changed", e.g. bulk jobs."""
+        event = {"resource": resource, "action": action, "ids": [str(record_id) for record_id in ids]}
+        await self._connect()
+        if self._redis is not None:
+            try:
+                await self._redis.publish(f"{CHANNEL_PREFIX}:{household_id}", json.dumps(event))
+                return
+            except (redis.RedisError, OSError) as e:
+                print(f"Warning: Could not publish {resource} {action} event to Redis: {e}")
+        self._deliver(household_id, event)
+
+    async def publish_batch(self, household_id: str, resource: str, outcome: Dict[str, List[str]]) -> None:
+        """Publish the created, updated and deleted ids of a batch_mutations outcome."""
+        for action in ("created", "updated", "deleted"):
+            if outcome[action]:
+                await self.publish(household_id, resource, action, outcome[action])
+
+    @asynccontextmanager
+    async def subscribe(self, household_id: str) -> AsyncIterator[asyncio.Queue]:
+        await self._connect()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(household_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(household_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[household_id]
+
+
+change_feed = ChangeFeed()
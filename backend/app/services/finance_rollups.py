@@ -0,0 +1,180 @@
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.models.database import upsert_insert
+
+DEFAULT_CATEGORY = "Other"
+GRANULARITIES = ("day", "week", "month")
+
+# Rollup tables maintained on every recorded transaction
+ROLLUP_MODELS = (models.FinanceDailyRollup, models.FinanceRollup)
+
+
+def day_start(value: datetime) -> date:
+    return date(value.year, value.month, value.day)
+
+
+def week_start(value: date) -> date:
+    return value - timedelta(days=value.weekday())
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_bucket(value: date, granularity: str) -> date:
+    if granularity == "day":
+        return value + timedelta(days=1)
+    if granularity == "week":
+        return value + timedelta(days=7)
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def _bucket_start(value: date, granularity: str) -> date:
+    if granularity == "day":
+        return value
+    if granularity == "week":
+        return week_start(value)
+    return month_start(value)
+
+
+def _period_bucket(db: Session, model, column):
+    """SQL expression truncating a timestamp column to the rollup's period."""
+    if db.get_bind().dialect.name == "postgresql":
+        unit = "day" if model is models.FinanceDailyRollup else "month"
+        return cast(func.date_trunc(unit, column), Date)
+    if model is models.FinanceDailyRollup:
+        return func.date(column)
+    return func.date(column, "start of month")
+
+
+def _period_for(model, value: datetime) -> date:
+    if model is models.FinanceDailyRollup:
+        return day_start(value)
+    return month_start(value)
+
+
+def apply_transaction(db: Session, transaction: models.FinancialTransaction) -> None:
+    """Fold a newly recorded transaction into its daily and monthly rollup buckets.
+
+    Runs as atomic upserts inside the caller's transaction so the rollups
+    and the transaction row are committed together.
+    """
+    insert = upsert_insert(db)
+    amount = Decimal(str(transaction.amount))
+    for model in ROLLUP_MODELS:
+        stmt = insert(model).values(
+            id=str(uuid.uuid4()),
+            household_id=transaction.household_id,
+            category=transaction.category or DEFAULT_CATEGORY,
+            period=_period_for(model, transaction.transaction_date),
+            is_expense=bool(transaction.is_expense),
+            total=amount,
+            transaction_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["household_id", "category", "period", "is_expense"],
+            set_={
+                "total": model.total + stmt.excluded.total,
+                "transaction_count": model.transaction_count + 1,
+            },
+        )
+        db.execute(stmt)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup bucket from the raw transactions with one GROUP BY per table."""
+    tx = models.FinancialTransaction
+    category = func.coalesce(tx.category, DEFAULT_CATEGORY)
+    buckets = 0
+    for model in ROLLUP_MODELS:
+        period = _period_bucket(db, model, tx.transaction_date)
+        rows = db.execute(
+            select(
+                tx.household_id,
+                category,
+                period,
+                tx.is_expense,
+                func.sum(tx.amount),
+                func.count(tx.id),
+            ).group_by(tx.household_id, category, period, tx.is_expense)
+        ).all()
+
+        db.query(model).delete(synchronize_session=False)
+        db.bulk_insert_mappings(model, [
+            {
+                "household_id": household_id,
+                "category": cat,
+                "period": bucket if isinstance(bucket, date) else date.fromisoformat(bucket),
+                "is_expense": bool(is_expense),
+                "total": total,
+                "transaction_count": count,
+            }
+            for household_id, cat, bucket, is_expense, total, count in rows
+        ])
+        buckets += len(rows)
+    return buckets
+
+
+def build_series(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    by_category: bool = False,
+    household_id: Optional[str] = None,
+) -> List[Dict]:
+    """Income and expense totals bucketed by day, week or month, read from the rollups.
+
+    Day and week buckets are read from the daily rollups; month buckets
+    from the monthly rollups, so the range is widened to whole months.
+    Without a category split every bucket in the range is returned,
+    including empty ones.
+    """
+    if granularity == "month":
+        model = models.FinanceRollup
+        start_date = month_start(start_date)
+    else:
+        model = models.FinanceDailyRollup
+
+    query = db.query(
+        model.period,
+        model.category,
+        model.is_expense,
+        func.sum(model.total),
+    ).filter(
+        model.period >= start_date,
+        model.period <= end_date,
+    )
+    if household_id:
+        query = query.filter(model.household_id == household_id)
+    rows = query.group_by(model.period, model.category, model.is_expense).all()
+
+    totals: Dict[Tuple[date, Optional[str]], Dict[str, float]] = {}
+    if not by_category:
+        bucket = _bucket_start(start_date, granularity)
+        while bucket <= end_date:
+            totals[(bucket, None)] = {"income": 0.0, "expenses": 0.0}
+            bucket = _next_bucket(bucket, granularity)
+
+    for period, category, is_expense, amount in rows:
+        key = (_bucket_start(period, granularity), category if by_category else None)
+        entry = totals.setdefault(key, {"income": 0.0, "expenses": 0.0})
+        entry["expenses" if is_expense else "income"] += float(amount or 0)
+
+    return [
+        {
+            "period": period,
+            "category": category,
+            "total_income": entry["income"],
+            "total_expenses": entry["expenses"],
+            "net_balance": entry["income"] - entry["expenses"],
+        }
+        for (period, category), entry in sorted(totals.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+    ]
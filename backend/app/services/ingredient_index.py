@@ -0,0 +1,151 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import models
+
+CHUNK_SIZE = 500
+
+
+def normalize_name(name: str) -> str:
+    """Canonical form used to match recipe ingredients against pantry items.
+
+    Lowercases, drops punctuation and collapses whitespace, then applies a
+    light plural rule so "Tomatoes" and "tomato" land on the same key.
+    """
+    words = re.findall(r"[^\W_]+", str(name).lower())
+    if not words:
+        return ""
+    last = words[-1]
+    if len(last) > 3 and last.endswith("ies"):
+        last = last[:-3] + "y"
+    elif len(last) > 3 and last.endswith("oes"):
+        last = last[:-2]
+    elif len(last) > 3 and last.endswith("s") and not last.endswith("ss"):
+        last = last[:-1]
+    return " ".join(words[:-1] + [last])
+
+
+def parse_quantity(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        if "/" in text:
+            numerator, denominator = text.split("/", 1)
+            return float(numerator) / float(denominator)
+        return float(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def ingredient_rows(recipe: models.Recipe) -> List[Dict[str, Any]]:
+    rows = []
+    for position, ingredient in enumerate(recipe.ingredients or []):
+        if isinstance(ingredient, dict):
+            name = str(ingredient.get("name") or "").strip()
+            quantity, unit = ingredient.get("quantity"), ingredient.get("unit")
+        else:
+            name, quantity, unit = str(ingredient).strip(), None, None
+        normalized = normalize_name(name)
+        if not normalized:
+            continue
+        rows.append({
+            "recipe_id": recipe.id,
+            "household_id": recipe.household_id,
+            "position": position,
+            "name": name,
+            "normalized_name": normalized,
+            "quantity": parse_quantity(quantity),
+            "unit": unit or None,
+        })
+    return rows
+
+
+def _write_rows(db: Session, recipe_ids: List[str]) -> None:
+    if not recipe_ids:
+        return
+    db.query(models.RecipeIngredient).filter(
+        models.RecipeIngredient.recipe_id.in_(recipe_ids)
+    ).delete(synchronize_session=False)
+
+    recipes = db.query(models.Recipe).filter(models.Recipe.id.in_(recipe_ids)).all()
+    rows = [row for recipe in recipes for row in ingredient_rows(recipe)]
+    if rows:
+        db.execute(insert(models.RecipeIngredient), rows)
+
+
+def refresh(db: Session, recipe_ids: Iterable[str]) -> None:
+    """Rewrite the ingredient rows of the given recipes; deleted recipes lose theirs."""
+    recipe_ids = list(recipe_ids)
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        _write_rows(db, recipe_ids[start:start + CHUNK_SIZE])
+
+
+def rebuild(db: Session) -> None:
+    db.query(models.RecipeIngredient).delete(synchronize_session=False)
+    refresh(db, [row.id for row in db.query(models.Recipe.id)])
+
+
+def match_pantry(
+    db: Session,
+    household_id: str,
+    pantry_names: Iterable[str],
+    limit: int = 20,
+    min_coverage: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """Rank recipes by the share of their ingredients found in the pantry.
+
+    Only recipes sharing at least one ingredient with the pantry are
+    touched: the (household_id, normalized_name) index yields the
+    candidates, and one more indexed lookup fetches their full
+    ingredient sets for the coverage and missing-ingredient lists.
+    """
+    pantry = {normalize_name(name) for name in pantry_names} - {""}
+    if not pantry:
+        return []
+
+    ri = models.RecipeIngredient
+    candidate_ids = [
+        row.recipe_id
+        for row in db.query(ri.recipe_id).filter(
+            ri.household_id == household_id,
+            ri.normalized_name.in_(pantry)
+        ).distinct()
+    ]
+    if not candidate_ids:
+        return []
+
+    ingredients: Dict[str, Dict[str, str]] = {}
+    for start in range(0, len(candidate_ids), CHUNK_SIZE):
+        for recipe_id, normalized, name in db.query(ri.recipe_id, ri.normalized_name, ri.name).filter(
+            ri.recipe_id.in_(candidate_ids[start:start + CHUNK_SIZE])
+        ):
+            ingredients.setdefault(recipe_id, {}).setdefault(normalized, name)
+
+    scored = []
+    for recipe_id, names in ingredients.items():
+        have = names.keys() & pantry
+        coverage = len(have) / len(names)
+        if coverage < min_coverage:
+            continue
+        scored.append((coverage, len(have), recipe_id))
+    scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+    scored = scored[:limit]
+
+    recipes = {
+        recipe.id: recipe
+        for recipe in db.query(models.Recipe).filter(models.Recipe.id.in_([s[2] for s in scored]))
+    }
+    return [
+        {
+            "recipe": recipes[recipe_id],
+            "coverage": coverage,
+            "matched_ingredients": sorted(ingredients[recipe_id][n] for n in ingredients[recipe_id].keys() & pantry),
+            "missing_ingredients": sorted(ingredients[recipe_id][n] for n in ingredients[recipe_id].keys() - pantry),
+        }
+        for coverage, _, recipe_id in scored
+        if recipe_id in recipes
+    ]
@@ -0,0 +1,142 @@
+"""
+Consumption forecasts for pantry items, computed from the stock ledger.
+
+For each item the consume and expire movements of the last
+INVENTORY_FORECAST_WINDOW_DAYS give a daily usage rate; the current
+quantity divided by it is the run-out date, and the suggested reorder
+tops the item up to INVENTORY_REORDER_COVER_DAYS of use plus its
+low-stock threshold. A refresh loads a whole household's items and
+movements at once and computes every forecast in a few NumPy passes.
+
+Results are stored in inventory_forecasts, which only write paths
+update: the ledger refreshes the items it moves in the same transaction,
+edits of a low-stock threshold refresh that item, and the nightly task
+refreshes everything so rates also decay while nothing is consumed.
+Reading them (upcoming) is a plain query that a replica can serve.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import models
+from app.models.database import upsert_insert
+
+# Movement reasons that count as using stock up
+CONSUMPTION_REASONS = ("consume", "expire")
+# Rows per multi-row upsert
+CHUNK_SIZE = 1000
+SECONDS_PER_DAY = 86400.0
+
+
+def refresh(
+    db: Session,
+    *criteria,
+    window_days: int = settings.INVENTORY_FORECAST_WINDOW_DAYS,
+    cover_days: int = settings.INVENTORY_REORDER_COVER_DAYS,
+    now: Optional[datetime] = None,
+) -> int:
+    """Recompute the forecasts of the inventory items matching `criteria`; returns how many."""
+    item, mv, snapshot = models.InventoryItem, models.InventoryMovement, models.InventorySnapshot
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=window_days)
+
+    items = db.execute(
+        select(item.id, item.household_id, item.quantity, item.low_stock_threshold).where(*criteria)
+    ).all()
+    if not items:
+        return 0
+    position = {row.id: i for i, row in enumerate(items)}
+    n = len(items)
+    quantity = np.array([row.quantity or 0 for row in items], dtype=float)
+    threshold = np.array([row.low_stock_threshold or 0 for row in items], dtype=float)
+    selected = select(item.id).where(*criteria)
+
+    moves = db.execute(
+        select(mv.item_id, mv.delta, mv.created_at).where(
+            mv.item_id.in_(selected),
+            mv.reason.in_(CONSUMPTION_REASONS),
+            mv.created_at >= since,
+        )
+    ).all()
+    consumed = np.zeros(n)
+    if moves:
+        index = np.fromiter((position[row.item_id] for row in moves), dtype=np.int64, count=len(moves))
+        used = np.fromiter((-row.delta for row in moves), dtype=float, count=len(moves))
+        consumed = np.bincount(index, weights=np.clip(used, 0, None), minlength=n)
+
+    # Days of history behind each rate: the full window, or less for items the ledger only recently saw
+    history = np.full(n, float(window_days))
+    first_seen = db.execute(
+        select(mv.item_id, func.min(mv.created_at)).where(mv.item_id.in_(selected)).group_by(mv.item_id)
+    ).all()
+    compacted = set(db.scalars(select(snapshot.item_id).where(snapshot.item_id.in_(selected))))
+    for item_id, first in first_seen:
+        if item_id not in compacted:
+            history[position[item_id]] = (now - first).total_seconds() / SECONDS_PER_DAY
+    history = np.clip(history, 1.0, float(window_days))
+
+    rate = consumed / history
+    using = rate > 0
+    days_left = np.divide(quantity, rate, out=np.full(n, np.nan), where=using)
+    target = np.where(using, rate * cover_days, 0.0) + threshold
+    suggested = np.ceil(np.clip(target - quantity, 0, None)).astype(int)
+
+    rows = [
+        {
+            "item_id": row.id,
+            "household_id": row.household_id,
+            "daily_rate": float(rate[i]),
+            "run_out_date": now + timedelta(days=float(days_left[i])) if using[i] else None,
+            "suggested_quantity": int(suggested[i]),
+            "computed_at": now,
+        }
+        for i, row in enumerate(items)
+    ]
+    forecast = models.InventoryForecast
+    insert_stmt = upsert_insert(db)
+    for start in range(0, n, CHUNK_SIZE):
+        stmt = insert_stmt(forecast).values(rows[start:start + CHUNK_SIZE])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["item_id"],
+            set_={column: stmt.excluded[column] for column in
+                  ("household_id", "daily_rate", "run_out_date", "suggested_quantity", "computed_at")},
+        ))
+    return n
+
+
+def refresh_all(db: Session) -> int:
+    """Nightly refresh, one vectorized pass per household."""
+    item = models.InventoryItem
+    refreshed = 0
+    for (household_id,) in db.execute(select(item.household_id).distinct()).all():
+        refreshed += refresh(db, item.household_id == household_id)
+    return refreshed
+
+
+def upcoming(db: Session, limit: int = 100, reorder_only: bool = False) -> List[Dict[str, Any]]:
+    """Items projected to run out, soonest first."""
+    forecast, item = models.InventoryForecast, models.InventoryItem
+    stmt = select(forecast, item.name, item.unit, item.quantity).join(
+        item, item.id == forecast.item_id
+    ).where(forecast.run_out_date.is_not(None))
+    if reorder_only:
+        stmt = stmt.where(forecast.suggested_quantity > 0)
+    now = datetime.utcnow()
+    return [
+        {
+            "item_id": row.item_id,
+            "name": name,
+            "unit": unit,
+            "quantity": quantity or 0,
+            "daily_rate": row.daily_rate,
+            "days_until_out": max((row.run_out_date - now).total_seconds() / SECONDS_PER_DAY, 0.0),
+            "run_out_date": row.run_out_date,
+            "suggested_quantity": row.suggested_quantity,
+            "computed_at": row.computed_at,
+        }
+        for row, name, unit, quantity in db.execute(
+            stmt.order_by(forecast.run_out_date, forecast.item_id).limit(limit)
+        )
+    ]
@@ -0,0 +1,152 @@
+"""
+Inventory stock ledger.
+
+inventory_items.quantity stays the live running total (the low-stock
+index and pantry lookups read it), but it only changes through atomic
+`quantity = quantity + delta` statements, each paired with an
+append-only inventory_movements row, so concurrent decrements never
+overwrite each other. compact() periodically folds old movements into
+inventory_snapshots; for every item
+
+    quantity == snapshot quantity + sum of the remaining movements
+
+and reconcile() restores that with an "adjust" movement for rows written
+outside the ledger (seed data, databases that predate it). Movements
+also refresh the consumption forecasts of the items they touch.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import models
+from app.models.database import upsert_insert
+from app.services import inventory_forecast
+
+REASONS = ("purchase", "consume", "expire", "adjust")
+# Rows per multi-row INSERT, well under SQLite's bound-parameter limit
+CHUNK_SIZE = 1000
+
+
+def apply_movements(db: Session, movements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply stock deltas atomically, in order; returns one result per movement.
+
+    A movement that would take the quantity below zero is refused with
+    status 409 rather than clamped, so the ledger always adds up.
+    """
+    item = models.InventoryItem
+    current = func.coalesce(item.quantity, 0)
+    now = datetime.utcnow()
+    results: List[Dict[str, Any]] = []
+    rows = []
+
+    for movement in movements:
+        item_id, delta = movement["item_id"], movement["delta"]
+        changed = db.execute(
+            update(item)
+            .where(item.id == item_id, current + delta >= 0)
+            .values(quantity=current + delta)
+            .returning(item.household_id)
+        ).first()
+        if changed is None:
+            missing = db.scalar(select(item.id).where(item.id == item_id)) is None
+            results.append({
+                "op": "movement",
+                "id": item_id,
+                "status": 404 if missing else 409,
+                "detail": "Not found" if missing else "Insufficient stock",
+            })
+            continue
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "household_id": changed.household_id,
+            "item_id": item_id,
+            "delta": delta,
+            "reason": movement["reason"],
+            "note": movement.get("note"),
+            "created_at": now,
+        })
+        results.append({"op": "movement", "id": item_id, "status": 200})
+
+    if rows:
+        db.execute(insert(models.InventoryMovement), rows)
+        inventory_forecast.refresh(db, item.id.in_({row["item_id"] for row in rows}))
+    return results
+
+
+def record_opening(db: Session, items: Iterable[models.InventoryItem]) -> None:
+    """Ledger entry for the stock new items were created with."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": item.household_id,
+            "item_id": item.id,
+            "delta": item.quantity,
+            "reason": "adjust",
+            "note": "opening stock",
+            "created_at": now,
+        }
+        for item in items if item.quantity
+    ]
+    if rows:
+        db.execute(insert(models.InventoryMovement), rows)
+
+
+def reconcile(db: Session) -> int:
+    """Add an "adjust" movement wherever quantity and ledger disagree; returns how many."""
+    item, snapshot, mv = models.InventoryItem, models.InventorySnapshot, models.InventoryMovement
+    tail = select(mv.item_id, func.sum(mv.delta).label("total")).group_by(mv.item_id).subquery()
+    drift = (
+        func.coalesce(item.quantity, 0)
+        - func.coalesce(snapshot.quantity, 0)
+        - func.coalesce(tail.c.total, 0)
+    )
+    # One statement, so quantities and ledger are read from the same snapshot
+    drifted = db.execute(
+        select(item.id, item.household_id, drift)
+        .outerjoin(snapshot, snapshot.item_id == item.id)
+        .outerjoin(tail, tail.c.item_id == item.id)
+        .where(drift != 0)
+    ).all()
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": household_id,
+            "item_id": item_id,
+            "delta": int(delta),
+            "reason": "adjust",
+            "note": "reconciled",
+            "created_at": now,
+        }
+        for item_id, household_id, delta in drifted
+    ]
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(models.InventoryMovement), rows[start:start + CHUNK_SIZE])
+    return len(rows)
+
+
+def compact(db: Session, before: datetime) -> int:
+    """Fold movements older than `before` into the item snapshots; returns items touched."""
+    mv, snapshot = models.InventoryMovement, models.InventorySnapshot
+    totals = db.execute(
+        select(mv.item_id, mv.household_id, func.sum(mv.delta))
+        .where(mv.created_at < before)
+        .group_by(mv.item_id, mv.household_id)
+    ).all()
+
+    insert_stmt = upsert_insert(db)
+    for start in range(0, len(totals), CHUNK_SIZE):
+        stmt = insert_stmt(snapshot).values([
+            {"item_id": item_id, "household_id": household_id, "quantity": int(total), "as_of": before}
+            for item_id, household_id, total in totals[start:start + CHUNK_SIZE]
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["item_id"],
+            set_={"quantity": snapshot.quantity + stmt.excluded.quantity, "as_of": stmt.excluded.as_of},
+        ))
+    if totals:
+        db.execute(delete(mv).where(mv.created_at < before))
+    return len(totals)
@@ -0,0 +1,140 @@
+import csv
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services import nutrition_rollups, recipe_indexes, resource_versions
+from app.services.recipe_import import recipe_from_name
+
+# Meal columns following the day and date columns, with the hour each meal is planned for
+MEAL_SLOTS = (("breakfast", 8), ("lunch", 12), ("dinner", 18))
+
+DATE_FORMATS = ("%B %d, %Y", "%B %d,%Y", "%B %d %Y", "%Y-%m-%d")
+YEARLESS_FORMATS = ("%B %d", "%B %d,")
+
+
+def parse_date(date_str: str, default_year: int = 2025) -> Optional[datetime]:
+    """Parse date string to datetime object"""
+    date_str = date_str.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+
+    # If no year provided, assume the default year
+    for fmt in YEARLESS_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).replace(year=default_year)
+        except ValueError:
+            continue
+    return None
+
+
+def _split_row(row: List[str]) -> Tuple[str, str, List[str]]:
+    """Split a row into day, date and meal cells.
+
+    Dates such as `November 10, 2025` are often left unquoted, which the
+    CSV reader splits into a `November 10` and a ` 2025` field.
+    """
+    day_name, date_str, rest = row[0], row[1], row[2:]
+    if len(rest) > len(MEAL_SLOTS) and rest[0].strip().isdigit():
+        date_str = f"{date_str.strip()}, {rest[0].strip()}"
+        rest = rest[1:]
+    return day_name.strip(), date_str, rest
+
+
+def parse_plan(handle: TextIO, default_year: int = 2025) -> Iterator[Dict[str, Any]]:
+    """Stream planned meals from a `day,date,breakfast,lunch,dinner` CSV.
+
+    Rows whose date cannot be parsed (including a header row) are
+    yielded with an `error` key so callers can report them.
+    """
+    for line_no, row in enumerate(csv.reader(handle), start=1):
+        if len(row) < 2 or not any(cell.strip() for cell in row):
+            continue
+        day_name, date_str, meals = _split_row(row)
+        planned = parse_date(date_str, default_year)
+        if not planned:
+            yield {"line": line_no, "error": f"Could not parse date: '{date_str}'"}
+            continue
+        for (meal_type, hour), cell in zip(MEAL_SLOTS, meals):
+            recipe_name = cell.strip().strip('"').strip()
+            if not recipe_name:
+                continue
+            yield {
+                "line": line_no,
+                "recipe_name": recipe_name,
+                "meal_type": meal_type,
+                "planned_date": planned.replace(hour=hour, minute=0, second=0),
+                "notes": f"Imported from meal plan - {day_name}",
+            }
+
+
+def import_meal_plan(
+    db: Session,
+    household_id: str,
+    entries: Iterable[Dict[str, Any]],
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Import parsed meal plan entries with a constant number of queries.
+
+    Recipes are resolved against a name -> id map loaded in one query;
+    missing recipes are created in one batch and all meal plans are
+    written with a single bulk insert.
+    """
+    recipe_ids = {
+        name.lower(): recipe_id
+        for recipe_id, name in db.query(models.Recipe.id, models.Recipe.name).filter(
+            models.Recipe.household_id == household_id
+        )
+    }
+
+    new_recipes: List[Dict[str, Any]] = []
+    meal_plans: List[Dict[str, Any]] = []
+    errors: List[str] = []
+
+    for entry in entries:
+        if "error" in entry:
+            errors.append(f"line {entry['line']}: {entry['error']}")
+            continue
+
+        key = entry["recipe_name"].lower()
+        recipe_id = recipe_ids.get(key)
+        if not recipe_id:
+            recipe_id = str(uuid.uuid4())
+            recipe_ids[key] = recipe_id
+            new_recipes.append({
+                "id": recipe_id,
+                "household_id": household_id,
+                **recipe_from_name(entry["recipe_name"], entry["meal_type"]),
+            })
+
+        meal_plans.append({
+            "household_id": household_id,
+            "recipe_id": recipe_id,
+            "meal_type": entry["meal_type"],
+            "planned_date": entry["planned_date"],
+            "status": "planned",
+            "notes": entry["notes"],
+        })
+
+    if not dry_run:
+        if new_recipes:
+            db.execute(insert(models.Recipe), new_recipes)
+            recipe_indexes.refresh(db, [r["id"] for r in new_recipes])
+            resource_versions.bump(db, household_id, "recipes")
+        if meal_plans:
+            db.execute(insert(models.MealPlan), meal_plans)
+            nutrition_rollups.refresh_days(db, household_id, {plan["planned_date"] for plan in meal_plans})
+            resource_versions.bump(db, household_id, "meal-plans")
+        db.commit()
+
+    return {
+        "recipes_created": len(new_recipes),
+        "meal_plans_created": len(meal_plans),
+        "errors": errors,
+        "dry_run": dry_run,
+    }
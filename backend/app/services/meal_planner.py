@@ -0,0 +1,252 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services.ingredient_index import normalize_name
+from app.services.recipe_tags import normalize_tag
+
+# Meal types planned each day and the hour they are scheduled at
+MEAL_SLOTS = (("breakfast", 8), ("lunch", 12), ("snack", 15), ("dinner", 18))
+
+DEFAULT_WEIGHTS = {
+    "recency": 2.0,    # prefer recipes not eaten recently
+    "time": 0.3,       # prefer quicker recipes
+    "pantry": 0.5,     # prefer recipes the pantry already covers
+    "tags": 0.7,       # prefer recipes carrying the requested tags
+    "nutrition": 0.3,  # prefer recipes close to the calorie target
+    "jitter": 0.05,    # random noise so equal scores do not always resolve the same way
+}
+
+# Days after which a recipe counts as fully "fresh" again
+RECENCY_HORIZON_DAYS = 28.0
+
+
+def _day_number(value: datetime) -> float:
+    return float(value.toordinal())
+
+
+def _calories(nutrition_info: Any) -> float:
+    if isinstance(nutrition_info, dict):
+        for key in ("calories", "kcal", "energy"):
+            try:
+                return float(nutrition_info[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return np.nan
+
+
+class RecipeCatalog:
+    """Per-recipe features held as NumPy arrays, indexed by catalog position.
+
+    Only household-independent features live here so a loaded catalog can
+    be shared between households; see `HouseholdState` for the rest.
+    """
+
+    def __init__(self, household_id: str, ids: Sequence[str], categories: Sequence[Optional[str]],
+                 total_time: np.ndarray, calories: np.ndarray, tag_vocab: Dict[str, int],
+                 tag_matrix: np.ndarray):
+        self.household_id = household_id
+        self.ids = np.asarray(ids, dtype=object)
+        self.position = {recipe_id: i for i, recipe_id in enumerate(ids)}
+        self.categories = np.asarray([c or "" for c in categories], dtype=object)
+        self.total_time = total_time
+        self.calories = calories
+        self.tag_vocab = tag_vocab
+        self.tag_matrix = tag_matrix
+
+        finite_time = total_time[np.isfinite(total_time)]
+        max_time = finite_time.max() if finite_time.size else 0.0
+        filled = np.where(np.isfinite(total_time), total_time, np.median(finite_time) if finite_time.size else 0.0)
+        self.time_norm = filled / max_time if max_time > 0 else np.zeros(len(ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, db: Session, household_id: str) -> "RecipeCatalog":
+        """Load the catalog with two narrow queries; JSON bodies other than nutrition are skipped."""
+        rows = db.query(
+            models.Recipe.id,
+            models.Recipe.category,
+            models.Recipe.prep_time,
+            models.Recipe.cook_time,
+            models.Recipe.nutrition_info,
+        ).filter(
+            models.Recipe.household_id == household_id
+        ).order_by(models.Recipe.id).all()
+
+        ids = [r.id for r in rows]
+        total_time = np.array(
+            [np.nan if r.prep_time is None and r.cook_time is None else (r.prep_time or 0) + (r.cook_time or 0)
+             for r in rows],
+            dtype=float,
+        )
+        calories = np.array([_calories(r.nutrition_info) for r in rows], dtype=float)
+
+        position = {recipe_id: i for i, recipe_id in enumerate(ids)}
+        tag_rows = db.query(models.RecipeTag.recipe_id, models.RecipeTag.tag).filter(
+            models.RecipeTag.household_id == household_id
+        ).all()
+        tag_vocab: Dict[str, int] = {}
+        for _, tag in tag_rows:
+            tag_vocab.setdefault(tag, len(tag_vocab))
+        tag_matrix = np.zeros((len(ids), len(tag_vocab)), dtype=bool)
+        for recipe_id, tag in tag_rows:
+            if recipe_id in position:
+                tag_matrix[position[recipe_id], tag_vocab[tag]] = True
+
+        return cls(household_id, ids, [r.category for r in rows], total_time, calories, tag_vocab, tag_matrix)
+
+
+class HouseholdState:
+    """Household-specific features aligned with a catalog: last use and pantry coverage."""
+
+    def __init__(self, last_used: np.ndarray, pantry_coverage: np.ndarray):
+        self.last_used = last_used
+        self.pantry_coverage = pantry_coverage
+
+    @classmethod
+    def load(cls, db: Session, catalog: RecipeCatalog, household_id: str,
+             pantry_names: Iterable[str] = ()) -> "HouseholdState":
+        last_used = np.full(len(catalog), np.nan)
+        for recipe_id, last_date in db.query(
+            models.MealPlan.recipe_id,
+            func.max(models.MealPlan.planned_date),
+        ).filter(
+            models.MealPlan.household_id == household_id
+        ).group_by(models.MealPlan.recipe_id):
+            i = catalog.position.get(recipe_id)
+            if i is not None and last_date is not None:
+                if isinstance(last_date, str):
+                    last_date = datetime.fromisoformat(last_date)
+                last_used[i] = _day_number(last_date)
+
+        coverage = np.zeros(len(catalog))
+        pantry = sorted({normalize_name(name) for name in pantry_names} - {""})
+        if pantry:
+            ri = models.RecipeIngredient
+            for recipe_id, total, matched in db.query(
+                ri.recipe_id,
+                func.count(ri.id),
+                func.sum(case((ri.normalized_name.in_(pantry), 1), else_=0)),
+            ).filter(
+                ri.household_id == catalog.household_id
+            ).group_by(ri.recipe_id):
+                i = catalog.position.get(recipe_id)
+                if i is not None and total:
+                    coverage[i] = float(matched or 0) / total
+
+        return cls(last_used, coverage)
+
+
+def _preference_vectors(catalog: RecipeCatalog, preferences: Dict[str, Any]):
+    """Static score component and eligibility mask derived from the preferences."""
+    weights = {**DEFAULT_WEIGHTS, **(preferences.get("weights") or {})}
+    n = len(catalog)
+
+    preferred = [catalog.tag_vocab[t] for t in {normalize_tag(t) for t in preferences.get("tags") or []}
+                 if t in catalog.tag_vocab]
+    tag_match = catalog.tag_matrix[:, preferred].mean(axis=1) if preferred else np.zeros(n)
+
+    allowed = np.ones(n, dtype=bool)
+    avoided = [catalog.tag_vocab[t] for t in {normalize_tag(t) for t in preferences.get("avoid_tags") or []}
+               if t in catalog.tag_vocab]
+    if avoided:
+        allowed &= ~catalog.tag_matrix[:, avoided].any(axis=1)
+    max_time = preferences.get("max_total_time")
+    if max_time is not None:
+        allowed &= ~(catalog.total_time > float(max_time))
+
+    nutrition_fit = np.zeros(n)
+    target = preferences.get("calorie_target")
+    if target:
+        target = float(target)
+        fit = 1.0 - np.minimum(1.0, np.abs(catalog.calories - target) / target)
+        nutrition_fit = np.where(np.isfinite(fit), fit, 0.5)
+
+    static = (
+        weights["time"] * (1.0 - catalog.time_norm)
+        + weights["tags"] * tag_match
+        + weights["nutrition"] * nutrition_fit
+    )
+    return weights, static, allowed
+
+
+def plan_meals(
+    catalog: RecipeCatalog,
+    state: HouseholdState,
+    start_date: datetime,
+    days: int = 7,
+    preferences: Optional[Dict[str, Any]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> List[Dict[str, Any]]:
+    """Choose a recipe for every meal slot in the period.
+
+    Each slot scores all eligible candidates in one vectorized pass:
+    the static preference score (computed once), pantry coverage and a
+    recency term that is updated as recipes are picked, so the plan
+    rotates through the catalog instead of repeating favourites.
+    Does not touch the database; `state.last_used` is updated in place.
+    """
+    preferences = preferences or {}
+    if not len(catalog):
+        return []
+    rng = rng or np.random.default_rng(preferences.get("seed"))
+    weights, static, allowed = _preference_vectors(catalog, preferences)
+    base = static + weights["pantry"] * state.pantry_coverage
+
+    eligible = {}
+    for meal_type, _ in MEAL_SLOTS:
+        in_category = catalog.categories == meal_type
+        if not in_category.any():
+            in_category = np.ones(len(catalog), dtype=bool)
+        mask = in_category & allowed
+        eligible[meal_type] = mask if mask.any() else in_category
+
+    last_used = state.last_used
+    picks = []
+    for day in range(days):
+        current = start_date + timedelta(days=day)
+        today = _day_number(current)
+        since = np.where(np.isnan(last_used), RECENCY_HORIZON_DAYS, today - last_used)
+        recency = np.clip(since, 0.0, RECENCY_HORIZON_DAYS) / RECENCY_HORIZON_DAYS
+
+        for meal_type, hour in MEAL_SLOTS:
+            scores = base + weights["recency"] * recency + weights["jitter"] * rng.random(len(catalog))
+            scores = np.where(eligible[meal_type], scores, -np.inf)
+            i = int(np.argmax(scores))
+            last_used[i] = today
+            recency[i] = 0.0
+            picks.append({
+                "recipe_id": catalog.ids[i],
+                "meal_type": meal_type,
+                "planned_date": current.replace(hour=hour, minute=0, second=0, microsecond=0),
+            })
+    return picks
+
+
+def plan_rows(household_id: str, picks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn picks into complete meal_plans rows, ids and timestamps included."""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": household_id,
+            "status": "planned",
+            "notes": None,
+            "created_at": now,
+            **pick,
+        }
+        for pick in picks
+    ]
+
+
+def insert_plans(db: Session, household_id: str, picks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Write picked meals with one multi-row INSERT; returns the inserted rows."""
+    rows = plan_rows(household_id, picks)
+    if rows:
+        db.execute(insert(models.MealPlan), rows)
+    return rows
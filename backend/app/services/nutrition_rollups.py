@@ -0,0 +1,136 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import models
+
+CHUNK_SIZE = 500
+GRANULARITIES = ("day", "week")
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _amount(value: Any) -> Optional[float]:
+    """Numeric part of a nutrition value such as 12, "12.5" or "30g"."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.match(str(value).strip())
+    return float(match.group()) if match else None
+
+
+def meal_nutrition(nutrition_info: Any, servings: Optional[int]) -> Dict[str, float]:
+    """Nutrition for one planned meal: per-serving values times the recipe's servings."""
+    if not isinstance(nutrition_info, dict):
+        return {}
+    scale = servings or 1
+    totals = {}
+    for nutrient, value in nutrition_info.items():
+        amount = _amount(value)
+        if amount is not None:
+            totals[nutrient] = amount * scale
+    return totals
+
+
+def _as_day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def refresh_days(db: Session, household_id: str, days: Iterable[date]) -> None:
+    """Recompute the daily rollups of a household for the given days."""
+    days = {_as_day(d) for d in days}
+    if not days:
+        return
+
+    mp, recipe = models.MealPlan, models.Recipe
+    rows = db.query(
+        mp.planned_date, recipe.nutrition_info, recipe.servings
+    ).join(
+        recipe, recipe.id == mp.recipe_id
+    ).filter(
+        mp.household_id == household_id,
+        mp.planned_date >= datetime.combine(min(days), datetime.min.time()),
+        mp.planned_date < datetime.combine(max(days) + timedelta(days=1), datetime.min.time()),
+    )
+
+    rollups: Dict[date, Dict[str, Any]] = {}
+    for planned_date, nutrition_info, servings in rows:
+        day = planned_date.date()
+        if day not in days:
+            continue
+        entry = rollups.setdefault(day, {"meal_count": 0, "totals": {}})
+        entry["meal_count"] += 1
+        for nutrient, amount in meal_nutrition(nutrition_info, servings).items():
+            entry["totals"][nutrient] = entry["totals"].get(nutrient, 0.0) + amount
+
+    day_list = sorted(days)
+    for start in range(0, len(day_list), CHUNK_SIZE):
+        db.query(models.NutritionRollup).filter(
+            models.NutritionRollup.household_id == household_id,
+            models.NutritionRollup.day.in_(day_list[start:start + CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+    if rollups:
+        db.execute(insert(models.NutritionRollup), [
+            {"household_id": household_id, "day": day, **entry}
+            for day, entry in rollups.items()
+        ])
+
+
+def refresh_range(db: Session, household_id: str, start: datetime, end: datetime) -> None:
+    first, last = _as_day(start), _as_day(end)
+    refresh_days(db, household_id, [first + timedelta(days=i) for i in range((last - first).days + 1)])
+
+
+def planned_days(db: Session, recipe_ids: Iterable[str]) -> Dict[str, Set[date]]:
+    """Days on which the recipes are planned, per household.
+
+    Deleting a recipe unlinks its plans, so collect these before the
+    delete and pass them to refresh_days afterwards.
+    """
+    recipe_ids = list(recipe_ids)
+    affected: Dict[str, Set[date]] = {}
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        for household_id, planned_date in db.query(
+            models.MealPlan.household_id, models.MealPlan.planned_date
+        ).filter(models.MealPlan.recipe_id.in_(recipe_ids[start:start + CHUNK_SIZE])):
+            affected.setdefault(household_id, set()).add(planned_date.date())
+    return affected
+
+
+def refresh_recipes(db: Session, recipe_ids: Iterable[str]) -> None:
+    """Recompute every day on which one of the recipes is planned."""
+    for household_id, days in planned_days(db, recipe_ids).items():
+        refresh_days(db, household_id, days)
+
+
+def rebuild(db: Session) -> None:
+    db.query(models.NutritionRollup).delete(synchronize_session=False)
+    affected: Dict[str, Set[date]] = {}
+    for household_id, planned_date in db.query(models.MealPlan.household_id, models.MealPlan.planned_date):
+        affected.setdefault(household_id, set()).add(planned_date.date())
+    for household_id, days in affected.items():
+        refresh_days(db, household_id, days)
+
+
+def series(
+    db: Session,
+    household_id: str,
+    start_date: date,
+    end_date: date,
+    granularity: str = "day",
+) -> List[Dict[str, Any]]:
+    """Daily or weekly (Monday-start) nutrition totals read from the rollups."""
+    buckets: Dict[date, Dict[str, Any]] = {}
+    for row in db.query(models.NutritionRollup).filter(
+        models.NutritionRollup.household_id == household_id,
+        models.NutritionRollup.day >= start_date,
+        models.NutritionRollup.day <= end_date
+    ).order_by(models.NutritionRollup.day):
+        period = row.day if granularity == "day" else row.day - timedelta(days=row.day.weekday())
+        entry = buckets.setdefault(period, {"period": period, "meal_count": 0, "totals": {}})
+        entry["meal_count"] += row.meal_count
+        for nutrient, amount in (row.totals or {}).items():
+            entry["totals"][nutrient] = entry["totals"].get(nutrient, 0.0) + amount
+    return list(buckets.values())
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(col.type, DateTime) else v
+            for col, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(columns: Sequence, values: Sequence[Any], descending: bool):
+    """Row-value comparison `(c1, c2, ...) > (v1, v2, ...)` expanded for portability."""
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence,
+    response: Response,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> List[Any]:
+    """Page through the rows of `stmt` ordered by the stable sort key `columns`.
+
+    With a cursor the page starts right after the encoded key (keyset
+    pagination, so deep pages cost the same as the first); without one
+    the legacy offset is applied. Whenever a full page is returned the
+    cursor for the next page is sent in the X-Next-Cursor header.
+    """
+    order = [c.desc() if descending else c.asc() for c in columns]
+    stmt = stmt.order_by(*order)
+    if cursor:
+        stmt = stmt.where(_after(columns, decode_cursor(cursor, columns), descending))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    items = (await db.scalars(stmt.limit(limit))).all()
+    if limit and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, column.key) for column in columns]
+        )
+    return items
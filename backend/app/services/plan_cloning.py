@@ -0,0 +1,88 @@
+from datetime import datetime
+from sqlalchemy import DateTime, String, func, insert, literal, literal_column, select, type_coerce
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services import sync
+
+# Ids per DELETE ... IN when replacing target plans
+CHUNK_SIZE = 500
+
+# Random v4 UUID computed inside SQLite, matching the ids the ORM generates
+SQLITE_UUID = (
+    "lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "substr('89ab', 1 + (abs(random()) % 4), 1) || substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "lower(hex(randomblob(6)))"
+)
+
+
+def _new_id(dialect: str):
+    if dialect == "postgresql":
+        return type_coerce(literal_column("gen_random_uuid()::text"), String)
+    return type_coerce(literal_column(SQLITE_UUID), String)
+
+
+def _shifted(dialect: str, column, seconds: int):
+    if dialect == "postgresql":
+        return column + func.make_interval(0, 0, 0, 0, 0, 0, seconds)
+    # Keep SQLAlchemy's storage format: shift the whole seconds, carry the fraction over
+    shifted = func.strftime("%Y-%m-%d %H:%M:%S", column, f"{seconds:+d} seconds").concat(func.substr(column, 20))
+    return type_coerce(shifted, DateTime)
+
+
+def clone_plans(
+    db: Session,
+    household_id: str,
+    source_start: datetime,
+    source_end: datetime,
+    target_start: datetime,
+    replace_existing: bool = False,
+) -> int:
+    """Copy every meal plan in the source range to the range starting at target_start.
+
+    Runs as one INSERT ... SELECT inside the database, so the cost does
+    not depend on how many plans are copied. With replace_existing the
+    plans already in the target range are deleted afterwards, by id, so
+    a target range overlapping the source still copies every source plan.
+    """
+    mp = models.MealPlan
+    dialect = db.get_bind().dialect.name
+    shift = int((target_start - source_start).total_seconds())
+    target_end = source_end + (target_start - source_start)
+    now = datetime.utcnow()
+
+    replaced = []
+    if replace_existing:
+        replaced = list(db.scalars(select(mp.id).where(
+            mp.household_id == household_id,
+            mp.planned_date >= target_start,
+            mp.planned_date <= target_end,
+        )))
+
+    source = select(
+        _new_id(dialect),
+        mp.household_id,
+        mp.recipe_id,
+        mp.meal_type,
+        _shifted(dialect, mp.planned_date, shift),
+        literal("planned"),
+        mp.notes,
+        literal(now, DateTime),
+        literal(now, DateTime),
+    ).where(
+        mp.household_id == household_id,
+        mp.planned_date >= source_start,
+        mp.planned_date <= source_end,
+    )
+    result = db.execute(
+        insert(mp).from_select(
+            ["id", "household_id", "recipe_id", "meal_type", "planned_date", "status", "notes", "created_at", "updated_at"],
+            source,
+        )
+    )
+
+    for start in range(0, len(replaced), CHUNK_SIZE):
+        chunk = mp.id.in_(replaced[start:start + CHUNK_SIZE])
+        sync.record_deletes(db, "meal_plans", household_id, mp, chunk)
+        db.query(mp).filter(chunk).delete(synchronize_session=False)
+    return result.rowcount
@@ -0,0 +1,183 @@
+import csv
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.models.database import upsert_insert
+from app.services import recipe_indexes, resource_versions
+
+CHUNK_SIZE = 1000
+
+# Spreadsheet column -> recipe category for the weekly meal sheet layout
+MEAL_COLUMNS = {
+    "Breakfast": "breakfast",
+    "Lunch": "lunch",
+    "Snacks": "snack",
+    "Dinner": "dinner",
+}
+
+UPDATABLE_FIELDS = (
+    "name", "description", "ingredients", "instructions", "prep_time",
+    "cook_time", "servings", "tags", "nutrition_info",
+)
+
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a CSV or Excel file as dicts keyed by the header row.
+
+    Excel files are opened in openpyxl's read-only mode so rows are
+    parsed lazily instead of loading the whole workbook.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+            for values in rows:
+                yield dict(zip(header, values))
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            yield from csv.DictReader(handle)
+
+
+def extract_ingredients(recipe_name: str) -> List[Dict[str, Any]]:
+    """Extract basic ingredients from recipe name"""
+    parts = str(recipe_name).replace('+', ',').replace(';', ',').split(',')
+    return [
+        {'name': part.strip(), 'quantity': 1, 'unit': 'serving'}
+        for part in parts if part.strip()
+    ]
+
+
+def recipe_from_name(recipe_name: str, meal_type: str) -> Dict[str, Any]:
+    """Build a placeholder recipe for a dish that only has a name."""
+    return {
+        "name": recipe_name,
+        "description": f"{meal_type.capitalize()} recipe",
+        "ingredients": extract_ingredients(recipe_name),
+        "instructions": f"Prepare {recipe_name}",
+        "prep_time": 15,
+        "cook_time": 30,
+        "servings": 4,
+        "category": meal_type,
+        "tags": [meal_type, "indian", "healthy"],
+    }
+
+
+def recipes_from_meal_rows(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Turn meal sheet rows (one column per meal type) into recipe dicts."""
+    for row in rows:
+        for column, meal_type in MEAL_COLUMNS.items():
+            value = row.get(column)
+            if value is None:
+                continue
+            recipe_name = str(value).strip()
+            if not recipe_name or recipe_name.lower() == "nan":
+                continue
+            yield recipe_from_name(recipe_name, meal_type)
+
+
+def recipe_key(name: str, category: str) -> Tuple[str, str]:
+    return (name.strip().lower(), category or "")
+
+
+def name_taken(db: Session, household_id: str, name: str, category: Optional[str],
+               exclude_id: Optional[str] = None) -> bool:
+    """Whether another recipe of the household already has this name and category.
+
+    Checked before single-recipe writes, which would otherwise fail on
+    the unique index the importers upsert against.
+    """
+    household, lower_name, category_key = models.RECIPE_NAME_KEY
+    # The index lowers in SQL, which can differ from str.lower beyond ASCII
+    stmt = select(models.Recipe.id).where(
+        household == household_id,
+        lower_name == func.lower(name.strip()),
+        category_key == (category or ""),
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(models.Recipe.id != exclude_id)
+    return db.scalar(stmt.limit(1)) is not None
+
+
+def _flush_chunk(db: Session, household_id: str, chunk: List[Dict[str, Any]], counts: Dict[str, int]) -> None:
+    recipe = models.Recipe
+    now = datetime.utcnow()
+    # Multi-row VALUES need the same columns in every row; sources differ in the fields they fill
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for fields in chunk:
+        row = {**fields, "id": str(uuid.uuid4()), "household_id": household_id,
+               "name": fields["name"].strip(), "created_at": now, "updated_at": now}
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    insert_stmt = upsert_insert(db)
+    proposed, written = set(), []
+    for columns, rows in groups.items():
+        proposed.update(row["id"] for row in rows)
+        stmt = insert_stmt(recipe).values(rows)
+        # Conflicts with rows committed concurrently by another import are updated too
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(models.RECIPE_NAME_KEY),
+            set_={
+                **{f: stmt.excluded[f] for f in UPDATABLE_FIELDS if f in columns},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        written += db.scalars(stmt.returning(recipe.id)).all()
+    recipe_indexes.refresh(db, written)
+    # Meal plan lists embed their recipes
+    resource_versions.bump(db, household_id, "recipes", "meal-plans")
+
+    # An updated row keeps its id, so only inserted rows return the id proposed for them
+    inserted = sum(1 for recipe_id in written if recipe_id in proposed)
+    counts["inserted"] += inserted
+    counts["updated"] += len(written) - inserted
+
+
+def import_recipes(
+    db: Session,
+    household_id: str,
+    recipes: Iterable[Dict[str, Any]],
+    chunk_size: int = CHUNK_SIZE,
+    commit_chunks: bool = False,
+) -> Dict[str, int]:
+    """Upsert recipes in chunks, deduplicating on (lower(name), category).
+
+    Each chunk is one INSERT ... ON CONFLICT DO UPDATE against the unique
+    index on that key, so existing recipes are updated in place and two
+    imports running at once cannot both insert the same recipe. The
+    caller commits, making the import all-or-nothing; with
+    `commit_chunks` every chunk is committed as it is written instead,
+    keeping write transactions short for large command-line imports.
+    """
+    counts = {"received": 0, "inserted": 0, "updated": 0, "duplicates": 0}
+    seen = set()
+    chunk: List[Dict[str, Any]] = []
+
+    for recipe in recipes:
+        counts["received"] += 1
+        key = recipe_key(recipe["name"], recipe.get("category"))
+        if key in seen:
+            counts["duplicates"] += 1
+            continue
+        seen.add(key)
+        chunk.append(recipe)
+        if len(chunk) >= chunk_size:
+            _flush_chunk(db, household_id, chunk, counts)
+            if commit_chunks:
+                db.commit()
+            chunk = []
+
+    if chunk:
+        _flush_chunk(db, household_id, chunk, counts)
+        if commit_chunks:
+            db.commit()
+    return counts
@@ -0,0 +1,15 @@
+from typing import Iterable
+from sqlalchemy.orm import Session
+from app.services import ingredient_index, nutrition_rollups, recipe_search, recipe_tags
+
+
+def refresh(db: Session, recipe_ids: Iterable[str]) -> None:
+    """Bring every index and rollup derived from the given recipes up to date.
+
+    Call after the recipe changes are flushed and before the commit.
+    """
+    recipe_ids = list(recipe_ids)
+    recipe_search.refresh(db, recipe_ids)
+    ingredient_index.refresh(db, recipe_ids)
+    recipe_tags.refresh(db, recipe_ids)
+    nutrition_rollups.refresh_recipes(db, recipe_ids)
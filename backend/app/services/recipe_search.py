@@ -0,0 +1,138 @@
+import re
+from typing import Iterable, List
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from app.models import models
+
+# SQLite: FTS5 table holding one document per recipe
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_search USING fts5("
+    "recipe_id UNINDEXED, household_id UNINDEXED, name, description, ingredients, tags, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+# Postgres: GIN index over the same document computed from the recipes row itself
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' "
+    "|| coalesce(ingredients::text, '') || ' ' || coalesce(tags::text, ''))"
+)
+PG_DDL = f"CREATE INDEX IF NOT EXISTS ix_recipes_search ON recipes USING GIN ({PG_DOCUMENT})"
+
+_ready = set()
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def create_index(db: Session) -> None:
+    """Create the full-text index in the current transaction, backfilling it if new."""
+    if _dialect(db) == "postgresql":
+        db.execute(text(PG_DDL))
+        return
+    db.execute(text(SQLITE_DDL))
+    if db.execute(text("SELECT 1 FROM recipe_search LIMIT 1")).first() is None:
+        _write_chunks(db, [row.id for row in db.query(models.Recipe.id)])
+
+
+def ensure_index(db: Session) -> bool:
+    """Create the index once per process; returns True if it had to be created."""
+    url = str(db.get_bind().url)
+    if url in _ready:
+        return False
+    create_index(db)
+    _ready.add(url)
+    return True
+
+
+def _document(recipe: models.Recipe) -> dict:
+    ingredients = recipe.ingredients or []
+    return {
+        "recipe_id": recipe.id,
+        "household_id": recipe.household_id,
+        "name": recipe.name or "",
+        "description": recipe.description or "",
+        "ingredients": " ".join(
+            str(i.get("name", "")) if isinstance(i, dict) else str(i) for i in ingredients
+        ),
+        "tags": " ".join(str(t) for t in (recipe.tags or [])),
+    }
+
+
+def _write_documents(db: Session, recipe_ids: List[str]) -> None:
+    if not recipe_ids:
+        return
+    db.execute(
+        text("DELETE FROM recipe_search WHERE recipe_id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": recipe_ids},
+    )
+
+    recipes = db.query(models.Recipe).filter(models.Recipe.id.in_(recipe_ids)).all()
+    if recipes:
+        db.execute(
+            text(
+                "INSERT INTO recipe_search (recipe_id, household_id, name, description, ingredients, tags) "
+                "VALUES (:recipe_id, :household_id, :name, :description, :ingredients, :tags)"
+            ),
+            [_document(recipe) for recipe in recipes],
+        )
+
+
+def _write_chunks(db: Session, recipe_ids: List[str], chunk_size: int = 500) -> None:
+    for start in range(0, len(recipe_ids), chunk_size):
+        _write_documents(db, recipe_ids[start:start + chunk_size])
+
+
+def refresh(db: Session, recipe_ids: Iterable[str]) -> None:
+    """Re-index the given recipes; ids that no longer exist are removed.
+
+    Call after the recipe rows are flushed and before the commit so the
+    index changes land in the same transaction. Postgres maintains its
+    expression index on its own.
+    """
+    ensure_index(db)
+    if _dialect(db) == "postgresql":
+        return
+    _write_chunks(db, list(recipe_ids))
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search(db: Session, household_id: str, query: str, limit: int = 20) -> List[models.Recipe]:
+    """Ranked prefix search over recipe name, description, ingredients and tags."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    if _dialect(db) == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        rows = db.execute(
+            text(
+                f"SELECT id FROM recipes WHERE household_id = :household_id "
+                f"AND {PG_DOCUMENT} @@ to_tsquery('simple', :query) "
+                f"ORDER BY ts_rank({PG_DOCUMENT}, to_tsquery('simple', :query)) DESC LIMIT :limit"
+            ),
+            {"household_id": household_id, "query": tsquery, "limit": limit},
+        )
+    else:
+        match = " ".join(f'"{term}"*' for term in terms)
+        rows = db.execute(
+            text(
+                "SELECT recipe_id FROM recipe_search WHERE recipe_search MATCH :query "
+                "AND household_id = :household_id ORDER BY bm25(recipe_search, 0, 0, 10.0, 2.0, 4.0, 3.0) "
+                "LIMIT :limit"
+            ),
+            {"household_id": household_id, "query": match, "limit": limit},
+        )
+    ranked_ids = [row[0] for row in rows]
+    if not ranked_ids:
+        return []
+
+    recipes = {
+        recipe.id: recipe
+        for recipe in db.query(models.Recipe).filter(models.Recipe.id.in_(ranked_ids))
+    }
+    return [recipes[recipe_id] for recipe_id in ranked_ids if recipe_id in recipes]
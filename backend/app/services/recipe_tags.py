@@ -0,0 +1,43 @@
+from typing import Iterable, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import models
+
+CHUNK_SIZE = 500
+
+
+def normalize_tag(tag) -> str:
+    return " ".join(str(tag).lower().split())
+
+
+def tag_rows(recipe: models.Recipe) -> List[dict]:
+    tags = {normalize_tag(tag) for tag in (recipe.tags or [])} - {""}
+    return [
+        {"recipe_id": recipe.id, "household_id": recipe.household_id, "tag": tag}
+        for tag in sorted(tags)
+    ]
+
+
+def _write_rows(db: Session, recipe_ids: List[str]) -> None:
+    if not recipe_ids:
+        return
+    db.query(models.RecipeTag).filter(
+        models.RecipeTag.recipe_id.in_(recipe_ids)
+    ).delete(synchronize_session=False)
+
+    recipes = db.query(models.Recipe).filter(models.Recipe.id.in_(recipe_ids)).all()
+    rows = [row for recipe in recipes for row in tag_rows(recipe)]
+    if rows:
+        db.execute(insert(models.RecipeTag), rows)
+
+
+def refresh(db: Session, recipe_ids: Iterable[str]) -> None:
+    """Rewrite the tag rows of the given recipes; deleted recipes lose theirs."""
+    recipe_ids = list(recipe_ids)
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        _write_rows(db, recipe_ids[start:start + CHUNK_SIZE])
+
+
+def rebuild(db: Session) -> None:
+    db.query(models.RecipeTag).delete(synchronize_session=False)
+    refresh(db, [row.id for row in db.query(models.Recipe.id)])
@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import models
+from app.models.database import upsert_insert
+
+
+def bump(db: Session, household_id: str, *resources: str) -> None:
+    """Increment the version of each resource inside the caller's transaction."""
+    insert = upsert_insert(db)
+    for resource in resources:
+        stmt = insert(models.ResourceVersion).values(household_id=household_id, resource=resource, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["household_id", "resource"],
+            set_={"version": models.ResourceVersion.version + 1},
+        ))
+
+
+def etag(resource: str, version: int) -> str:
+    return f'W/"{resource}-{version}"'
+
+
+def _matches(if_none_match: Optional[str], tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" name the same representation
+    return "*" in candidates or tag in candidates or tag[2:] in candidates
+
+
+async def not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    household_id: str,
+    resource: str,
+) -> Optional[Response]:
+    """Conditional GET for a list endpoint.
+
+    Reads only the resource's version row: when the client's
+    If-None-Match still names it, a bodiless 304 is returned and the
+    list query is skipped; otherwise the ETag is set on `response` and
+    None tells the handler to build the list as usual.
+    """
+    version = await db.scalar(select(models.ResourceVersion.version).where(
+        models.ResourceVersion.household_id == household_id,
+        models.ResourceVersion.resource == resource
+    ))
+    tag = etag(resource, version or 0)
+    if _matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers={"ETag": tag})
+    response.headers["ETag"] = tag
+    return None
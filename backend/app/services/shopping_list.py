@@ -0,0 +1,124 @@
+import math
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services.ingredient_index import normalize_name
+
+Key = Tuple[str, str]
+
+
+def _unit_key(unit) -> str:
+    return (unit or "").strip().lower()
+
+
+def planned_requirements(
+    db: Session,
+    household_id: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> Dict[Key, Dict[str, Any]]:
+    """Sum ingredient quantities per (name, unit) over every meal planned in the range.
+
+    One GROUP BY over meal_plans joined to the normalized recipe_ingredients
+    rows; ingredients without a quantity count as one unit per meal.
+    """
+    ri, mp = models.RecipeIngredient, models.MealPlan
+    rows = db.query(
+        ri.normalized_name,
+        func.lower(func.coalesce(ri.unit, "")),
+        func.min(ri.name),
+        func.sum(func.coalesce(ri.quantity, 1.0)),
+        func.count(func.distinct(ri.recipe_id)),
+        func.min(ri.recipe_id),
+    ).join(
+        mp, mp.recipe_id == ri.recipe_id
+    ).filter(
+        mp.household_id == household_id,
+        mp.planned_date >= start_date,
+        mp.planned_date <= end_date,
+    ).group_by(
+        ri.normalized_name,
+        func.lower(func.coalesce(ri.unit, "")),
+    ).all()
+
+    return {
+        (normalized, unit): {
+            "name": name,
+            "unit": unit or None,
+            "quantity": float(quantity or 0),
+            "recipe_id": recipe_id if recipe_count == 1 else None,
+        }
+        for normalized, unit, name, quantity, recipe_count, recipe_id in rows
+    }
+
+
+def subtract_inventory(db: Session, needs: Dict[Key, Dict[str, Any]]) -> None:
+    """Reduce each requirement by the stock on hand with the same name and unit."""
+    stock: Dict[Key, float] = {}
+    for name, quantity, unit in db.query(
+        models.InventoryItem.name,
+        models.InventoryItem.quantity,
+        models.InventoryItem.unit,
+    ).filter(models.InventoryItem.quantity > 0):
+        key = (normalize_name(name), _unit_key(unit))
+        stock[key] = stock.get(key, 0) + quantity
+
+    for key, need in needs.items():
+        on_hand = stock.get(key, 0)
+        if not on_hand and not key[1]:
+            # Unitless ingredients match stock counted in any unit
+            on_hand = sum(q for (n, _), q in stock.items() if n == key[0])
+        need["quantity"] = max(0.0, need["quantity"] - on_hand)
+
+
+def merge_into_list(
+    db: Session,
+    household_id: str,
+    needs: Dict[Key, Dict[str, Any]],
+) -> Tuple[List[str], List[str]]:
+    """Merge requirements into the unpurchased shopping list.
+
+    Items already on the list are raised to the required quantity rather
+    than duplicated, so regenerating the same range is idempotent. All
+    changes go out as one bulk UPDATE and one multi-row INSERT.
+    """
+    existing: Dict[Key, models.ShoppingListItem] = {}
+    for item in db.query(models.ShoppingListItem).filter(
+        models.ShoppingListItem.household_id == household_id,
+        models.ShoppingListItem.is_purchased == False
+    ):
+        existing.setdefault((normalize_name(item.name), _unit_key(item.unit)), item)
+
+    to_insert, to_update = [], []
+    for key, need in needs.items():
+        quantity = math.ceil(need["quantity"])
+        if quantity <= 0:
+            continue
+        item = existing.get(key)
+        if item is None:
+            to_insert.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "name": need["name"],
+                "quantity": quantity,
+                "unit": need["unit"],
+                "category": "Other",
+                "added_from_recipe_id": need["recipe_id"],
+            })
+        elif (item.quantity or 0) < quantity:
+            to_update.append({"id": item.id, "quantity": quantity})
+
+    if to_insert:
+        db.execute(insert(models.ShoppingListItem), to_insert)
+    if to_update:
+        db.execute(update(models.ShoppingListItem), to_update)
+    return [row["id"] for row in to_insert], [row["id"] for row in to_update]
+
+
+def stamp_purchased(change: Dict[str, Any], item: models.ShoppingListItem) -> None:
+    """apply_batch update hook: record when an item is first checked off."""
+    if change.get("is_purchased") and not item.purchased_at:
+        change["purchased_at"] = datetime.utcnow()
@@ -0,0 +1,75 @@
+"""
+Delta sync for offline-first clients.
+
+Every synced table carries an indexed change time (updated_at, or the
+older last_updated of inventory items) and every delete leaves a
+Tombstone, so a client that passes back the watermark of its last sync
+only receives the rows changed or deleted since then.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import DateTime, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services.cache import ALL_HOUSEHOLDS
+
+# Writes stamp updated_at before they commit, so a transaction still in
+# flight when a sync reads can commit rows older than the watermark. The
+# watermark handed out is moved back by this margin; clients receive such
+# rows twice, never zero times.
+WATERMARK_GRACE = timedelta(seconds=5)
+
+# Sync field -> (model, whether the resource is filtered by household)
+RESOURCES = {
+    "chores": (models.Chore, False),
+    "inventory": (models.InventoryItem, False),
+    "finance": (models.FinancialTransaction, False),
+    "recipes": (models.Recipe, True),
+    "meal_plans": (models.MealPlan, True),
+    "shopping_list": (models.ShoppingListItem, True),
+}
+
+
+def changed_at(model):
+    """The column a model stamps on every write, used as its sync watermark."""
+    return getattr(model, "updated_at", None) or model.last_updated
+
+
+def record_deletes(db: Session, resource: str, household_id: str, model, *criteria) -> None:
+    """Leave a tombstone for each row of `model` matching `criteria`; call before deleting them."""
+    db.execute(insert(models.Tombstone).from_select(
+        ["resource", "record_id", "household_id", "deleted_at"],
+        select(
+            literal(resource),
+            model.id,
+            literal(household_id),
+            literal(datetime.utcnow(), DateTime),
+        ).where(*criteria),
+    ))
+
+
+def changes(db: Session, household_id: str, since: Optional[datetime]) -> Dict[str, Any]:
+    """Rows of every synced resource updated at or after `since`, plus tombstones.
+
+    Without `since` everything is returned (a full sync) and no tombstones.
+    """
+    if since is not None and since.tzinfo is not None:
+        # Timestamps are stored as naive UTC
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    watermark = datetime.utcnow() - WATERMARK_GRACE
+    result: Dict[str, Any] = {"watermark": watermark}
+
+    for field, (model, scoped) in RESOURCES.items():
+        stmt = select(model)
+        if scoped:
+            stmt = stmt.where(model.household_id == household_id)
+        column = changed_at(model)
+        if since is not None:
+            stmt = stmt.where(column >= since)
+        result[field] = db.scalars(stmt.order_by(column)).all()
+
+    result["deleted"] = [] if since is None else db.scalars(select(models.Tombstone).where(
+        models.Tombstone.household_id.in_([household_id, ALL_HOUSEHOLDS]),
+        models.Tombstone.deleted_at >= since
+    ).order_by(models.Tombstone.deleted_at)).all()
+    return result
@@ -0,0 +1,40 @@
+"""
+Nightly maintenance of the inventory stock ledger.
+
+Reconciles item quantities written outside the ledger, folds movements
+older than the retention window into per-item snapshots so the
+movements table only holds the recent tail, and refreshes every
+household's consumption forecasts.
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.services import inventory_forecast, inventory_ledger
+
+
+def run_compaction(retention_days: int = settings.INVENTORY_LEDGER_RETENTION_DAYS) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        reconciled = inventory_ledger.reconcile(db)
+        compacted = inventory_ledger.compact(db, datetime.utcnow() - timedelta(days=retention_days))
+        forecasts = inventory_forecast.refresh_all(db)
+        db.commit()
+        return {"reconciled": reconciled, "compacted": compacted, "forecasts": forecasts}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact the inventory stock ledger")
+    parser.add_argument("--retention-days", type=int, default=settings.INVENTORY_LEDGER_RETENTION_DAYS,
+                        help="Keep individual movements this many days")
+    args = parser.parse_args()
+
+    result = run_compaction(args.retention_days)
+    print(f"Reconciled {result['reconciled']} items, compacted movements of {result['compacted']} items, "
+          f"refreshed {result['forecasts']} forecasts")
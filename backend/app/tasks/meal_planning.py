@@ -0,0 +1,141 @@
+"""
+Batch meal plan generation for many households in one job.
+
+The recipe catalog is loaded once and shared; each household only adds
+its own recency and pantry state. Plans are written in chunked bulk
+inserts and progress is reported on the job's AgentTask row.
+"""
+import argparse
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import insert, select, union
+from app.models.database import SessionLocal
+from app.models import models
+from app.services import meal_planner, nutrition_rollups, resource_versions
+
+AGENT_NAME = "meal_planner"
+TASK_TYPE = "batch_meal_plan"
+DEFAULT_HOUSEHOLD_ID = "default-household"
+CHUNK_SIZE = 2000
+
+
+def create_task(db, start_date: datetime, weeks: int, household_ids: Optional[List[str]] = None,
+                preferences: Optional[Dict[str, Any]] = None,
+                catalog_household_id: str = DEFAULT_HOUSEHOLD_ID) -> models.AgentTask:
+    """Add a pending batch planning task; the caller commits before running it."""
+    task = models.AgentTask(
+        agent_name=AGENT_NAME,
+        task_type=TASK_TYPE,
+        status="pending",
+        input_data={
+            "start_date": start_date.isoformat(),
+            "weeks": weeks,
+            "household_ids": household_ids,
+            "preferences": preferences or {},
+            "catalog_household_id": catalog_household_id,
+        },
+    )
+    db.add(task)
+    db.flush()
+    return task
+
+
+def _household_ids(db) -> List[str]:
+    # The API plans for a demo household that has no Household row, only recipes and plans
+    return sorted(db.scalars(union(
+        select(models.Household.id),
+        select(models.Recipe.household_id).where(models.Recipe.household_id.is_not(None)),
+        select(models.MealPlan.household_id).where(models.MealPlan.household_id.is_not(None)),
+    )))
+
+
+def _report(db, task: models.AgentTask, **progress) -> None:
+    task.output_data = {**(task.output_data or {}), **progress}
+    db.commit()
+
+
+def run_batch_plan(task_id: str, chunk_size: int = CHUNK_SIZE) -> None:
+    """Execute a batch planning task created by `create_task`."""
+    db = SessionLocal()
+    task = db.get(models.AgentTask, task_id)
+    if task is None:
+        db.close()
+        return
+
+    try:
+        params = task.input_data or {}
+        start_date = datetime.fromisoformat(params["start_date"])
+        days = 7 * int(params.get("weeks", 1))
+        preferences = params.get("preferences") or {}
+        household_ids = params.get("household_ids") or _household_ids(db)
+
+        task.status = "running"
+        _report(db, task, households_total=len(household_ids), households_done=0, meal_plans_created=0)
+
+        catalog = meal_planner.RecipeCatalog.load(db, params.get("catalog_household_id", DEFAULT_HOUSEHOLD_ID))
+        pending: List[Dict[str, Any]] = []
+        pending_days: Dict[str, Set[date]] = {}
+        created = 0
+
+        for done, household_id in enumerate(household_ids, start=1):
+            pantry = [
+                name for (name,) in db.query(models.InventoryItem.name).filter(
+                    models.InventoryItem.household_id == household_id,
+                    models.InventoryItem.quantity > 0
+                )
+            ]
+            state = meal_planner.HouseholdState.load(db, catalog, household_id, pantry)
+            picks = meal_planner.plan_meals(catalog, state, start_date, days=days, preferences=preferences)
+            rows = meal_planner.plan_rows(household_id, picks)
+            pending.extend(rows)
+            pending_days.setdefault(household_id, set()).update(row["planned_date"].date() for row in rows)
+
+            if len(pending) >= chunk_size or done == len(household_ids):
+                if pending:
+                    db.execute(insert(models.MealPlan), pending)
+                    for pending_household, planned_days in pending_days.items():
+                        nutrition_rollups.refresh_days(db, pending_household, planned_days)
+                        resource_versions.bump(db, pending_household, "meal-plans")
+                    created += len(pending)
+                    pending, pending_days = [], {}
+                _report(db, task, households_done=done, meal_plans_created=created)
+
+        task.status = "completed"
+        task.completed_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        task.status = "failed"
+        task.error_message = str(e)
+        task.completed_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate meal plans for many households")
+    parser.add_argument("--start-date", required=True, help="ISO date the plans start on")
+    parser.add_argument("--weeks", type=int, default=1)
+    parser.add_argument("--household-id", action="append", dest="household_ids",
+                        help="Household to plan for; repeat for several (default: every household with recipes or plans)")
+    parser.add_argument("--catalog-household-id", default=DEFAULT_HOUSEHOLD_ID)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        task = create_task(db, datetime.fromisoformat(args.start_date), args.weeks,
+                           args.household_ids, catalog_household_id=args.catalog_household_id)
+        db.commit()
+        task_id = task.id
+    finally:
+        db.close()
+
+    run_batch_plan(task_id)
+
+    db = SessionLocal()
+    try:
+        task = db.get(models.AgentTask, task_id)
+        print(f"Task {task_id}: {task.status} {task.output_data or {}} {task.error_message or ''}")
+    finally:
+        db.close()
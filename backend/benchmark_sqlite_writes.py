@@ -0,0 +1,106 @@
+"""
+Benchmark concurrent API writes against SQLite with and without the production profile
+
+Each mode runs in its own process on a fresh temporary database: the
+default profile (rollback journal, full fsync, every request commits on
+its own connection) and SQLITE_PRODUCTION=1 (WAL, tuned pragmas and the
+group-committing single writer). Concurrent clients POST shopping list
+items through the ASGI app and the script reports write throughput and
+failed requests such as "database is locked".
+
+    python benchmark_sqlite_writes.py --requests 2000 --concurrency 50
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import asyncio
+import tempfile
+import subprocess
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+MODES = {"default": "0", "production": "1"}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare SQLite write throughput of the two profiles")
+    parser.add_argument("--requests", type=int, default=1000, help="Total POST requests per mode")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--mode", choices=sorted(MODES), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+async def run_clients(total, concurrency):
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    counter = iter(range(total))
+    errors = {}
+
+    async def client_loop(client):
+        for i in counter:
+            try:
+                response = await client.post("/api/v1/meals/shopping-list", json={"name": f"Item {i}"})
+                if response.status_code != 200:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            except Exception as exc:
+                key = type(exc).__name__
+                errors[key] = errors.get(key, 0) + 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, errors
+
+
+def run_mode(args):
+    """Child process: the database settings are fixed at import time, one mode per process."""
+    from app.models.init_db import init_db
+    init_db()
+    elapsed, errors = asyncio.run(run_clients(args.requests, args.concurrency))
+    failed = sum(errors.values())
+    print(json.dumps({
+        "elapsed": elapsed,
+        "ok": args.requests - failed,
+        "errors": errors,
+    }))
+
+
+def main():
+    args = parse_args()
+    if args.mode:
+        run_mode(args)
+        return 0
+
+    results = {}
+    for mode, flag in MODES.items():
+        with tempfile.TemporaryDirectory() as scratch:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{scratch}/bench.db", SQLITE_PRODUCTION=flag)
+            print(f"⏱️  Running {mode} profile: {args.requests} writes, {args.concurrency} concurrent...")
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode,
+                 "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\n{'profile':<12}{'writes/s':>12}{'ok':>8}{'failed':>8}  errors")
+    for mode, result in results.items():
+        rate = result["ok"] / result["elapsed"] if result["elapsed"] else 0.0
+        failed = sum(result["errors"].values())
+        print(f"{mode:<12}{rate:>12.1f}{result['ok']:>8}{failed:>8}  {result['errors'] or '-'}")
+
+    base, tuned = results["default"], results["production"]
+    if base["ok"] and tuned["elapsed"]:
+        speedup = (tuned["ok"] / tuned["elapsed"]) / (base["ok"] / base["elapsed"])
+        print(f"\n🚀 Production profile: {speedup:.1f}x write throughput")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Regression check for the batch meal plan job
+
+Seeds a scratch database with a recipe catalog and several households,
+then runs the batch planning task with a chunk size small enough that it
+writes more than one chunk. Exits non-zero unless the task completes and
+every household ends up with the same full plan, its nutrition rollups
+and a bumped meal-plans version.
+
+    python check_batch_planning.py                  # temporary SQLite database
+    python check_batch_planning.py --households 12 --chunk-size 30
+"""
+import sys
+import os
+import argparse
+import tempfile
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+DEFAULT_HOUSEHOLD_ID = "default-household"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fail when the batch meal plan job does not plan every household")
+    parser.add_argument("--households", type=int, default=6, help="Households to plan for")
+    parser.add_argument("--weeks", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=30, help="Rows per bulk insert; keep it below one run's plans")
+    return parser.parse_args()
+
+
+def seed(db, households):
+    import uuid
+    from sqlalchemy import insert
+    from app.models import models
+    from app.services import recipe_indexes
+
+    household_ids = [DEFAULT_HOUSEHOLD_ID] + [str(uuid.uuid4()) for _ in range(households - 1)]
+    # Like the API's demo household, the catalog owner has no Household row
+    db.execute(insert(models.Household), [{"id": h, "name": f"Household {i}"} for i, h in enumerate(household_ids[1:])])
+    categories = ["breakfast", "lunch", "snack", "dinner"]
+    recipes = [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": DEFAULT_HOUSEHOLD_ID,
+            "name": f"Recipe {i}",
+            "category": categories[i % len(categories)],
+            "ingredients": [{"name": f"ingredient {i % 13}", "quantity": 1}],
+            "nutrition_info": {"calories": 100 + i},
+            "servings": 2,
+        }
+        for i in range(80)
+    ]
+    db.execute(insert(models.Recipe), recipes)
+    db.flush()
+    recipe_indexes.refresh(db, [r["id"] for r in recipes])
+    db.commit()
+    return household_ids
+
+
+def main():
+    args = parse_args()
+    scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    scratch.close()
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    from datetime import datetime
+    from sqlalchemy import func, select
+    from app.models import models
+    from app.models.database import engine, SessionLocal
+    from app.models.init_db import init_db
+    from app.tasks import meal_planning
+
+    try:
+        init_db()
+        db = SessionLocal()
+        try:
+            household_ids = seed(db, args.households)
+            task_id = meal_planning.create_task(db, datetime(2025, 6, 2), args.weeks).id
+            db.commit()
+        finally:
+            db.close()
+
+        print(f"🗓️  Planning {len(household_ids)} households in chunks of {args.chunk_size} rows...")
+        meal_planning.run_batch_plan(task_id, chunk_size=args.chunk_size)
+
+        db = SessionLocal()
+        try:
+            task = db.get(models.AgentTask, task_id)
+            progress = task.output_data or {}
+            plans = dict(db.execute(
+                select(models.MealPlan.household_id, func.count()).group_by(models.MealPlan.household_id)
+            ).all())
+            rollups = dict(db.execute(
+                select(models.NutritionRollup.household_id, func.count()).group_by(models.NutritionRollup.household_id)
+            ).all())
+            versions = set(db.scalars(select(models.ResourceVersion.household_id).where(
+                models.ResourceVersion.resource == "meal-plans"
+            )))
+        finally:
+            db.close()
+
+        problems = []
+        if task.status != "completed":
+            problems.append(f"task ended {task.status}: {task.error_message}")
+        created = progress.get("meal_plans_created", 0)
+        if created <= args.chunk_size:
+            problems.append(f"only {created} plans written, fewer than one chunk of {args.chunk_size}")
+        per_household = {plans.get(h, 0) for h in household_ids}
+        if len(per_household) != 1 or 0 in per_household:
+            problems.append(f"uneven plans per household: {sorted(plans.get(h, 0) for h in household_ids)}")
+        if sum(plans.values()) != created:
+            problems.append(f"task reports {created} plans, database holds {sum(plans.values())}")
+        for household_id in household_ids:
+            if household_id not in versions:
+                problems.append(f"household {household_id}: meal-plans version not bumped")
+            if rollups.get(household_id, 0) != 7 * args.weeks:
+                problems.append(f"household {household_id}: {rollups.get(household_id, 0)} nutrition rollup days")
+
+        print(f"🔎 Task {task.status}: {created} plans for {progress.get('households_done')} households")
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print("✅ Every household planned across several chunks")
+        return 0
+    finally:
+        engine.dispose()
+        os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Query-plan regression check for the API routers
+
+Seeds a scratch database, calls every router endpoint through the FastAPI
+test client, captures each SQL statement the handlers issue and runs it
+through EXPLAIN (SQLite `EXPLAIN QUERY PLAN`, Postgres `EXPLAIN` with
+sequential scans disabled). Exits non-zero when any statement scans a
+whole table instead of using an index, so a missing index shows up
+before the data grows. Endpoints listed in QUERY_BUDGETS also fail the
+check when one call issues more SELECTs than its budget, so an N+1 loop
+cannot creep back in.
+
+    python check_query_plans.py                     # temporary SQLite database
+    python check_query_plans.py --database-url postgresql://.../scratch
+"""
+import sys
+import os
+import re
+import argparse
+import tempfile
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+DEFAULT_HOUSEHOLD_ID = "default-household"
+
+# Tables that only ever hold a handful of rows; scanning them is fine
+SMALL_TABLES = {"households", "schema_migrations", "sqlite_master"}
+
+# Statements that are not worth explaining
+SKIPPED = re.compile(r"^\s*(INSERT\s+INTO\s+\w+\s*\(.*\)\s*VALUES|PRAGMA|SAVEPOINT|RELEASE|ROLLBACK|BEGIN|COMMIT|ANALYZE|CREATE|DROP)",
+                     re.IGNORECASE | re.DOTALL)
+
+# (method, path) -> SELECTs one call may issue, not counting the ETag version lookup
+QUERY_BUDGETS = {
+    # A month of plans with their recipes in one joined query
+    ("GET", "/api/v1/meals/meal-plans"): 1,
+}
+SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+VERSION_LOOKUP = re.compile(r"\bFROM resource_versions\b", re.IGNORECASE)
+
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fail when a router query does a full table scan")
+    parser.add_argument("--database-url", help="Scratch database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--recipes", type=int, default=2000, help="Recipes to seed (other tables scale with it)")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every statement")
+    return parser.parse_args()
+
+
+def seed(db, size):
+    """Fill every table with enough rows that the planner has a real choice to make."""
+    import uuid
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+    from app.models import models
+    from app.services import finance_rollups, recipe_indexes
+
+    now = datetime.utcnow().replace(microsecond=0)
+    households = [DEFAULT_HOUSEHOLD_ID] + [str(uuid.uuid4()) for _ in range(3)]
+    db.execute(insert(models.Household), [{"id": h, "name": f"Household {i}"} for i, h in enumerate(households)])
+
+    categories = ["breakfast", "lunch", "dinner", "snack"]
+    recipes = []
+    for i in range(size):
+        recipes.append({
+            "id": str(uuid.uuid4()),
+            "household_id": households[i % len(households)],
+            "name": f"Recipe {i}",
+            "category": categories[i % len(categories)],
+            "ingredients": [{"name": f"ingredient {i % 97}", "quantity": 1, "unit": "cup"},
+                            {"name": f"ingredient {i % 89}", "quantity": 2}],
+            "instructions": "Cook it",
+            "prep_time": 5 + i % 20,
+            "cook_time": 10 + i % 30,
+            "servings": 2,
+            "tags": [f"tag{i % 11}"],
+            "nutrition_info": {"calories": 200 + i % 400},
+            "created_at": now - timedelta(minutes=i),
+        })
+    db.execute(insert(models.Recipe), recipes)
+    db.flush()
+    recipe_indexes.refresh(db, [r["id"] for r in recipes])
+
+    by_household = {}
+    for recipe in recipes:
+        by_household.setdefault(recipe["household_id"], []).append(recipe["id"])
+
+    plans, items, stock, chores, transactions = [], [], [], [], []
+    for h, household_id in enumerate(households):
+        own = by_household[household_id]
+        for i in range(size):
+            plans.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "recipe_id": own[i % len(own)],
+                "meal_type": categories[i % len(categories)],
+                "planned_date": now - timedelta(hours=6 * i),
+                "status": "planned",
+            })
+        for i in range(size // 4):
+            items.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "name": f"item {i}",
+                "quantity": 1 + i % 5,
+                "category": "Other",
+                "is_purchased": i % 3 == 0,
+                "created_at": now - timedelta(minutes=i),
+            })
+            stock.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "name": f"ingredient {i}",
+                "quantity": i % 10,
+                "unit": "cup",
+                "low_stock_threshold": 1,
+                "last_updated": now - timedelta(days=1),
+            })
+            chores.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "name": f"chore {i}",
+                "frequency": "weekly",
+                "due_date": now + timedelta(days=i % 30),
+            })
+            transactions.append({
+                "id": str(uuid.uuid4()),
+                "household_id": household_id,
+                "amount": 10 + i % 90,
+                "category": ["Groceries", "Utilities", "Salary"][i % 3],
+                "is_expense": i % 3 != 2,
+                "transaction_date": now - timedelta(days=i % 400),
+            })
+    for model, rows in ((models.MealPlan, plans), (models.ShoppingListItem, items),
+                        (models.InventoryItem, stock), (models.Chore, chores),
+                        (models.FinancialTransaction, transactions)):
+        db.execute(insert(model), rows)
+    finance_rollups.rebuild_rollups(db)
+    from app.services import nutrition_rollups
+    nutrition_rollups.rebuild(db)
+    # Stock history as the nightly inventory job leaves it: ledger opened, forecasts built
+    from app.services import inventory_forecast, inventory_ledger
+    db.execute(insert(models.InventoryMovement), [
+        {"id": str(uuid.uuid4()), "household_id": row["household_id"], "item_id": row["id"],
+         "delta": -1, "reason": "consume", "created_at": now - timedelta(days=1 + i % 7)}
+        for i, row in enumerate(stock) if i % 2 == 0
+    ])
+    inventory_ledger.reconcile(db)
+    inventory_forecast.refresh_all(db)
+    db.commit()
+    return {
+        "recipe_id": by_household[DEFAULT_HOUSEHOLD_ID][0],
+        "meal_plan_id": next(p["id"] for p in plans if p["household_id"] == DEFAULT_HOUSEHOLD_ID),
+        "item_id": next(i["id"] for i in items if i["household_id"] == DEFAULT_HOUSEHOLD_ID),
+        "stock_id": stock[0]["id"],
+        "chore_id": chores[0]["id"],
+        "start": (now - timedelta(days=14)).isoformat(),
+        "month_start": (now - timedelta(days=30)).isoformat(),
+        "end": now.isoformat(),
+    }
+
+
+def scenarios(ids):
+    """One call per router endpoint, in an order where every id still exists."""
+    api = "/api/v1"
+    start_day, end_day = ids["start"][:10], ids["end"][:10]
+    return [
+        ("get", f"{api}/chores/", {"params": {"limit": 20}}),
+        ("post", f"{api}/chores/", {"json": {"name": "Water plants", "frequency": "weekly"}}),
+        ("patch", f"{api}/chores/{ids['chore_id']}", {"json": {"points": 3}}),
+        ("post", f"{api}/chores/{ids['chore_id']}/complete", {}),
+        ("patch", f"{api}/chores/batch", {"json": {"create": [{"name": "Dust"}], "update": [{"id": ids["chore_id"], "points": 4}]}}),
+        ("get", f"{api}/inventory/", {"params": {"limit": 20}}),
+        ("post", f"{api}/inventory/", {"json": {"name": "Rice", "quantity": 2, "unit": "kg"}}),
+        ("patch", f"{api}/inventory/{ids['stock_id']}", {"json": {"quantity": 5}}),
+        ("get", f"{api}/inventory/low-stock", {}),
+        ("post", f"{api}/inventory/{ids['stock_id']}/movements", {"json": {"delta": -1, "reason": "consume"}}),
+        ("get", f"{api}/inventory/{ids['stock_id']}/movements", {"params": {"limit": 20}}),
+        ("get", f"{api}/inventory/forecast", {}),
+        ("post", f"{api}/inventory/{ids['stock_id']}/movements", {"json": {"delta": -1, "reason": "consume"}}),
+        ("get", f"{api}/inventory/forecast", {"params": {"reorder_only": True}}),
+        ("post", f"{api}/inventory/batch", {"json": {"create": [{"name": "Oats"}], "update": [{"id": ids["stock_id"], "quantity": 6}]}}),
+        ("get", f"{api}/finance/transactions", {"params": {"limit": 20}}),
+        ("post", f"{api}/finance/transactions", {"json": {"amount": 12.5, "category": "Groceries", "is_expense": True}}),
+        ("get", f"{api}/finance/summary", {}),
+        ("get", f"{api}/finance/series", {"params": {"start_date": start_day, "end_date": end_day, "granularity": "day"}}),
+        ("get", f"{api}/meals/recipes", {"params": {"limit": 20}}),
+        ("get", f"{api}/meals/recipes", {"params": {"category": "lunch", "limit": 20}}),
+        ("get", f"{api}/meals/recipes", {"params": {"tag": "tag3", "limit": 20}}),
+        ("get", f"{api}/meals/recipes", {"params": {"ingredient": "ingredient 5", "limit": 20}}),
+        ("get", f"{api}/meals/recipes/search", {"params": {"q": "recipe"}}),
+        ("get", f"{api}/meals/recipes/pantry-match", {}),
+        ("post", f"{api}/meals/recipes", {"json": {"name": "Plan check soup", "ingredients": [{"name": "water"}], "category": "lunch"}}),
+        ("get", f"{api}/meals/recipes/{ids['recipe_id']}", {}),
+        ("put", f"{api}/meals/recipes/{ids['recipe_id']}", {"json": {"prep_time": 7}}),
+        ("get", f"{api}/meals/meal-plans", {"params": {"start_date": ids["start"], "end_date": ids["end"]}}),
+        ("get", f"{api}/meals/meal-plans", {"params": {"start_date": ids["month_start"], "end_date": ids["end"]}}),
+        ("post", f"{api}/meals/meal-plans", {"json": {"recipe_id": ids["recipe_id"], "meal_type": "dinner",
+                                                       "planned_date": ids["end"]}}),
+        ("get", f"{api}/meals/meal-plans/{ids['meal_plan_id']}", {}),
+        ("put", f"{api}/meals/meal-plans/{ids['meal_plan_id']}", {"json": {"status": "cooked"}}),
+        ("post", f"{api}/meals/meal-plans/generate-weekly", {"json": {"recipes": [], "start_date": ids["end"]}}),
+        ("post", f"{api}/meals/meal-plans/clone", {"json": {"source_start": ids["start"], "source_end": ids["end"],
+                                                             "target_start": ids["end"]}}),
+        ("get", f"{api}/meals/nutrition", {"params": {"start_date": start_day, "end_date": end_day}}),
+        ("get", f"{api}/meals/shopping-list", {}),
+        ("post", f"{api}/meals/shopping-list", {"json": {"name": "Milk"}}),
+        ("put", f"{api}/meals/shopping-list/{ids['item_id']}", {"json": {"is_purchased": True}}),
+        ("patch", f"{api}/meals/shopping-list/batch", {"json": {"create": [{"name": "Eggs"}],
+                                                                 "update": [{"id": ids["item_id"], "quantity": 2}]}}),
+        ("post", f"{api}/meals/shopping-list/from-meal-plan/{ids['meal_plan_id']}", {}),
+        ("post", f"{api}/meals/shopping-list/from-meal-plans", {"json": {"start_date": ids["start"],
+                                                                          "end_date": ids["end"]}}),
+        ("delete", f"{api}/meals/shopping-list/{ids['item_id']}", {}),
+        ("delete", f"{api}/meals/meal-plans/{ids['meal_plan_id']}", {}),
+        ("get", f"{api}/agents/status/unknown-task", {}),
+        ("get", f"{api}/sync/", {"params": {"since": ids["end"]}}),
+    ]
+
+
+def explain(raw_connection, dialect, statement, parameters):
+    """Return (plan lines, scanned tables) for one captured statement."""
+    cursor = raw_connection.cursor()
+    try:
+        if dialect == "postgresql":
+            cursor.execute("EXPLAIN " + statement, parameters)
+            lines = [row[0] for row in cursor.fetchall()]
+            scanned = {m.group(1) for line in lines for m in POSTGRES_SCAN.finditer(line)}
+        else:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            lines = [row[-1] for row in cursor.fetchall()]
+            scanned = {m.group(1) for m in map(SQLITE_SCAN.match, lines) if m}
+    finally:
+        cursor.close()
+    return lines, scanned - SMALL_TABLES
+
+
+def main():
+    args = parse_args()
+    scratch = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    from sqlalchemy import event, text
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.models.database import async_engine, engine, SessionLocal
+    from app.models.init_db import init_db
+
+    try:
+        init_db()
+        db = SessionLocal()
+        try:
+            print(f"🌱 Seeding {args.recipes} recipes...")
+            ids = seed(db, args.recipes)
+            db.execute(text("ANALYZE"))
+            db.commit()
+        finally:
+            db.close()
+
+        captured = []
+
+        # Routers run on the async engine, background jobs on the sync one
+        engines = (engine, async_engine.sync_engine)
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and not SKIPPED.match(statement):
+                captured.append((statement, parameters))
+
+        for target in engines:
+            event.listen(target, "before_cursor_execute", capture)
+        client = TestClient(app)
+        over_budget = []
+        for method, path, kwargs in scenarios(ids):
+            before = len(captured)
+            response = getattr(client, method)(path, **kwargs)
+            if response.status_code >= 500:
+                print(f"❌ {method.upper()} {path} failed with {response.status_code}")
+                return 1
+            budget = QUERY_BUDGETS.get((method.upper(), path))
+            if budget is not None:
+                selects = [statement for statement, _ in captured[before:]
+                           if SELECT.match(statement) and not VERSION_LOOKUP.search(statement)]
+                if len(selects) > budget:
+                    over_budget.append((f"{method.upper()} {path}", kwargs, len(response.json()), selects, budget))
+            for i in range(before, len(captured)):
+                captured[i] = (f"{method.upper()} {path}",) + captured[i]
+        for target in engines:
+            event.remove(target, "before_cursor_execute", capture)
+
+        dialect = engine.dialect.name
+        raw = engine.raw_connection()
+        failures, seen = [], set()
+        try:
+            if dialect == "postgresql":
+                cursor = raw.cursor()
+                cursor.execute("SET enable_seqscan = off")
+                cursor.close()
+            for endpoint, statement, parameters in captured:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                lines, scanned = explain(raw, dialect, statement, parameters)
+                if args.verbose:
+                    print(f"\n{endpoint}\n{statement}\n  " + "\n  ".join(lines))
+                if scanned:
+                    failures.append((endpoint, statement, sorted(scanned), lines))
+        finally:
+            raw.close()
+
+        print(f"\n🔎 Checked {len(seen)} distinct statements from {len(scenarios(ids))} endpoint calls")
+        for endpoint, kwargs, rows, selects, budget in over_budget:
+            print(f"\n❌ {endpoint} {kwargs.get('params', {})}: {len(selects)} SELECTs for {rows} rows, budget {budget}")
+            for statement in selects[:3]:
+                print(f"   {' '.join(statement.split())}")
+        for endpoint, statement, tables, lines in failures:
+            print(f"\n❌ {endpoint}: full scan of {', '.join(tables)}")
+            print(f"   {' '.join(statement.split())}")
+            for line in lines:
+                print(f"     {line}")
+        if failures:
+            print(f"\n❌ {len(failures)} statement(s) scan a whole table")
+        if over_budget:
+            print(f"\n❌ {len(over_budget)} call(s) exceed their query budget")
+        if failures or over_budget:
+            return 1
+        print("✅ No full table scans, query budgets met")
+        return 0
+    finally:
+        engine.dispose()
+        if scratch:
+            os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
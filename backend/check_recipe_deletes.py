@@ -0,0 +1,87 @@
+"""
+Regression check for deleting a recipe that is still planned
+
+Seeds a scratch database through the API with a recipe planned on two
+days, deletes the recipe and exits non-zero unless delta sync still
+answers, reporting the plans (now without a recipe) and the recipe's
+tombstone, and the daily nutrition rollups no longer count the recipe.
+
+    python check_recipe_deletes.py                  # temporary SQLite database
+"""
+import sys
+import os
+import tempfile
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+PLANNED_DAYS = ("2025-03-03", "2025-03-04")
+
+
+def main():
+    scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    scratch.close()
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.models.database import engine
+    from app.models.init_db import init_db
+
+    try:
+        init_db()
+        client = TestClient(app, raise_server_exceptions=False)
+        api = "/api/v1"
+        recipe_id = client.post(f"{api}/meals/recipes", json={
+            "name": "Check curry", "servings": 1, "ingredients": [], "nutrition_info": {"calories": 400},
+        }).json()["id"]
+        plan_ids = [
+            client.post(f"{api}/meals/meal-plans", json={
+                "recipe_id": recipe_id, "meal_type": "dinner", "planned_date": f"{day}T18:00:00",
+            }).json()["id"]
+            for day in PLANNED_DAYS
+        ]
+        since = client.get(f"{api}/sync/").json()["watermark"]
+        nutrition = {"start_date": PLANNED_DAYS[0], "end_date": PLANNED_DAYS[-1]}
+        before = client.get(f"{api}/meals/nutrition", params=nutrition).json()["points"]
+
+        print(f"🗑️  Deleting a recipe planned on {len(plan_ids)} days...")
+        problems = []
+        response = client.delete(f"{api}/meals/recipes/{recipe_id}")
+        if response.status_code != 200:
+            problems.append(f"DELETE /meals/recipes answered {response.status_code}")
+
+        response = client.get(f"{api}/sync/", params={"since": since})
+        if response.status_code != 200:
+            problems.append(f"GET /sync answered {response.status_code}: {response.text[:200]}")
+        else:
+            changes = response.json()
+            synced = {plan["id"]: plan for plan in changes["meal_plans"]}
+            for plan_id in plan_ids:
+                if plan_id not in synced:
+                    problems.append(f"plan {plan_id} missing from the delta")
+                elif synced[plan_id]["recipe_id"] is not None:
+                    problems.append(f"plan {plan_id} still points at the deleted recipe")
+            if recipe_id not in {t["record_id"] for t in changes["deleted"] if t["resource"] == "recipes"}:
+                problems.append("no tombstone for the deleted recipe")
+
+        points = client.get(f"{api}/meals/nutrition", params=nutrition).json()["points"]
+        if len(before) != len(PLANNED_DAYS) or any(point["totals"].get("calories") != 400 for point in before):
+            problems.append(f"rollups before the delete: {before}")
+        for point in points:
+            if point["meal_count"] or point["totals"].get("calories"):
+                problems.append(f"{point['period']} still counts the deleted recipe: {point}")
+
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print("✅ Sync and nutrition rollups stay consistent after deleting a planned recipe")
+        return 0
+    finally:
+        engine.dispose()
+        os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,7 @@ import {
   UtensilsCrossed
 } from 'lucide-react';
 import Link from 'next/link';
-import { choresApi, inventoryApi, financeApi, agentApi } from '@/lib/api';
+import { choresApi, inventoryApi, financeApi, agentApi, subscribeToChanges } from '@/lib/api';
 
 const DashboardCard = ({ title, value, icon: Icon, color, description }: any) => (
   <div className="glass rounded-2xl p-6 card-hover">
@@ -105,8 +105,12 @@ export default function HomeDashboard() {
 
   useEffect(() => {
     fetchData();
-    const interval = setInterval(fetchData, 30000); // Auto refresh every 30s
-    return () => clearInterval(interval);
+    // Refresh when the server reports a change instead of polling
+    return subscribeToChanges((event) => {
+      if (event.action === 'resync' || ['chores', 'inventory', 'finance'].includes(event.resource)) {
+        fetchData();
+      }
+    });
   }, []);
 
 const [isChatOpen, setIsChatOpen] = useState(false);
@@ -43,3 +43,14 @@ export const financeApi = {
   listTransactions: () => fetchApi('/finance/transactions'),
   record: (data: any) => fetchApi('/finance/transactions', { method: 'POST', body: JSON.stringify(data) }),
 };
+
+// Push updates from the server; the callback gets {resource, action, ids}.
+// Events missed while disconnected are not replayed: refetch on 'resync'.
+export const subscribeToChanges = (onChange: (event: any) => void, householdId?: string) => {
+  const query = householdId ? `?household_id=${encodeURIComponent(householdId)}` : '';
+  const source = new EventSource(`${API_URL}/events/${query}`);
+  source.addEventListener('change', (message) => onChange(JSON.parse((message as MessageEvent).data)));
+  // Reconnects are automatic; treat them like an overflow and refetch
+  source.onerror = () => onChange({ resource: null, action: 'resync', ids: [] });
+  return () => source.close();
+};